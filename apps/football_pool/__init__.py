@@ -3,10 +3,13 @@ from pathlib import Path
 from flask import Flask, g, render_template, request
 from flask_migrate import Migrate
 
+from .cli import pool_cli
 from .config import Config
+from .metrics import init_metrics
 from .models import db
+from .timing import init_request_timing
 from .views import Theme, app_blueprint
-from .years import get_current_season_start_year, get_season_str, list_of_tracked_seasons
+from .years import get_season_str, get_selected_season_start_year, list_of_tracked_seasons
 
 migrate = Migrate(db=db)
 
@@ -14,6 +17,9 @@ migrate = Migrate(db=db)
 def create_app(config_filename: Path | None = None):
     app = Flask(__name__)
     app.config.from_object(Config)
+    # apply overrides before any extension reads the config
+    if config_filename:
+        app.config.from_pyfile(config_filename)
 
     # Register blueprints
     app.register_blueprint(app_blueprint)
@@ -22,6 +28,13 @@ def create_app(config_filename: Path | None = None):
     db.init_app(app)
     migrate.init_app(app, db)
 
+    # Register the `flask pool ...` commands
+    app.cli.add_command(pool_cli)
+
+    # Time each phase of every request, and record metrics for `/metrics`
+    init_request_timing(app)
+    init_metrics(app)
+
     @app.before_request
     def load_theme():
         """Loads the theme from the cookies and puts it into the g variables."""
@@ -33,9 +46,7 @@ def create_app(config_filename: Path | None = None):
     @app.context_processor
     def inject_season_year_info():
         """Make the selected year and tracked years available to all templates"""
-        season_start_year = request.cookies.get("season_start_year")
-        if season_start_year is None:
-            season_start_year = str(get_current_season_start_year())
+        season_start_year = str(get_selected_season_start_year())
         app.logger.debug("COOKIE: season_start_year='%s'", season_start_year)
         tracked_years_dict = {year: get_season_str(year) for year in list_of_tracked_seasons()}
         return {"season_start_year": season_start_year, "tracked_years_dict": tracked_years_dict}
@@ -44,7 +55,11 @@ def create_app(config_filename: Path | None = None):
     @app.shell_context_processor
     def make_shell_context():
         from .get_scores import get_live_scores
-        from .models import Owner, Pot, Team, WinningGame
+        from .get_scores.client import get_espn_client
+        from .get_scores.leaderboard import refresh_season_leaderboard
+        from .get_scores.teams import invalidate_team_map
+        from .models import LeaderboardEntry, Owner, Pot, Team, WinningGame
+        from .page_cache import get_page_cache
 
         return {
             "db": db,
@@ -52,7 +67,12 @@ def create_app(config_filename: Path | None = None):
             "Owner": Owner,
             "WinningGame": WinningGame,
             "Pot": Pot,
+            "LeaderboardEntry": LeaderboardEntry,
             "get_live_scores": get_live_scores,
+            "get_espn_client": get_espn_client,
+            "invalidate_team_map": invalidate_team_map,
+            "refresh_season_leaderboard": refresh_season_leaderboard,
+            "get_page_cache": get_page_cache,
         }
 
     @app.errorhandler(404)
@@ -67,7 +87,4 @@ def create_app(config_filename: Path | None = None):
         app.logger.debug("Shit, I screwed up. Rendering 500 template.")
         return render_template("http/500.html"), 500
 
-    if config_filename:
-        app.config.from_pyfile(config_filename)
-
     return app
@@ -0,0 +1,60 @@
+"""Contains the `flask pool ...` commands, used to run the app's background processes and maintenance tasks."""
+
+import click
+from flask.cli import AppGroup
+
+pool_cli = AppGroup("pool", help="Commands for running the football pool's background processes and maintenance tasks.")
+
+
+@pool_cli.command("poll")
+def poll() -> None:
+    """Polls ESPN for live scores and publishes them to the web workers."""
+    from .get_scores.poller import poll_scoreboard
+
+    poll_scoreboard()
+
+
+@pool_cli.command("worker")
+def worker() -> None:
+    """Runs the scheduled jobs, like computing each week's results. Only run one worker per database."""
+    from .job_scheduling import run_scheduler_worker
+
+    run_scheduler_worker()
+
+
+@pool_cli.command("rebuild")
+@click.option("--season", type=int, default=None, help="The year in which the season started. Defaults to the current.")
+@click.option("--dry-run", is_flag=True, help="Only report the differences, without applying them.")
+def rebuild(season: int | None, dry_run: bool) -> None:
+    """Rebuilds the owners' balances and the pot from the winning games, reporting what differed."""
+    from .get_scores.rebuild import rebuild_season
+    from .get_scores.write_to_db import acquire_settlement_lock
+    from .models import db
+
+    acquire_settlement_lock()
+    report = rebuild_season(season)
+    for line in report.lines():
+        click.echo(line)
+    if not report.changed:
+        click.echo(f"The {report.season_start_year} season's totals match the winning games.")
+    if dry_run:
+        db.session.rollback()
+        return
+    db.session.commit()
+    if report.changed:
+        click.echo("Applied.")
+
+
+@pool_cli.command("backfill")
+@click.option("--season", type=int, default=None, help="The year in which the season started. Defaults to the current.")
+@click.option(
+    "--concurrency", type=click.IntRange(min=1), default=None, help="How many weeks to query ESPN for at once."
+)
+@click.option("--dry-run", is_flag=True, help="Only report what would be settled, without writing it.")
+def backfill(season: int | None, concurrency: int | None, dry_run: bool) -> None:
+    """Settles every finished week of a season that was missed, from ESPN's scoreboards."""
+    from .get_scores.backfill import backfill_season
+
+    report = backfill_season(season, concurrency=concurrency, dry_run=dry_run)
+    for line in report.lines():
+        click.echo(line)
@@ -76,6 +76,74 @@ class Config(object):
 
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
 
+    # CACHING
+    # a directory shared by every gunicorn worker (and the scheduler) on the same host
+    CACHE_DIR = Path(os.getenv("FLASK_CACHE_DIR", "/var/tmp/%s" % PROJECT_NAME))
+    # how long a scoreboard fetched from ESPN is served before one worker refreshes it
+    SCOREBOARD_CACHE_TTL = timedelta(seconds=int(os.getenv("FLASK_SCOREBOARD_CACHE_TTL", "15")))
+    # how long past due the last good scoreboard can be served while ESPN is unavailable, before erroring instead
+    SCOREBOARD_MAX_STALENESS = timedelta(minutes=int(os.getenv("FLASK_SCOREBOARD_MAX_STALENESS", "60")))
+    # how long past due the scoreboard can be before the home page marks it "stale as of" when it was fetched
+    SCOREBOARD_STALE_NOTICE = timedelta(seconds=int(os.getenv("FLASK_SCOREBOARD_STALE_NOTICE", "30")))
+    # whether the home page shows why the scoreboard is unavailable, rather than just that it is
+    SCOREBOARD_SHOW_ERRORS = os.getenv("FLASK_SCOREBOARD_SHOW_ERRORS", "1" if DEBUG else "0") == "1"
+
+    # ESPN CLIENT
+    # (connect, read) timeouts for each request, in seconds
+    ESPN_CONNECT_TIMEOUT = float(os.getenv("FLASK_ESPN_CONNECT_TIMEOUT", "3.05"))
+    ESPN_READ_TIMEOUT = float(os.getenv("FLASK_ESPN_READ_TIMEOUT", "5"))
+    # failed requests are retried this many times, waiting `backoff * 2 ** attempt` seconds in between
+    ESPN_MAX_RETRIES = int(os.getenv("FLASK_ESPN_MAX_RETRIES", "2"))
+    ESPN_RETRY_BACKOFF = float(os.getenv("FLASK_ESPN_RETRY_BACKOFF", "0.5"))
+    # after this many failed queries in a row, stop querying ESPN for the cooldown and serve cached data
+    ESPN_BREAKER_THRESHOLD = int(os.getenv("FLASK_ESPN_BREAKER_THRESHOLD", "5"))
+    ESPN_BREAKER_COOLDOWN = timedelta(seconds=int(os.getenv("FLASK_ESPN_BREAKER_COOLDOWN", "60")))
+
+    # SCOREBOARD POLLER (`flask pool poll`)
+    # how often to poll ESPN while any game is being played, while games are queued, and once all are final
+    SCOREBOARD_POLL_LIVE = timedelta(seconds=int(os.getenv("FLASK_SCOREBOARD_POLL_LIVE", "10")))
+    SCOREBOARD_POLL_QUEUED = timedelta(minutes=int(os.getenv("FLASK_SCOREBOARD_POLL_QUEUED", "5")))
+    SCOREBOARD_POLL_FINAL = timedelta(hours=int(os.getenv("FLASK_SCOREBOARD_POLL_FINAL", "1")))
+    # how long to wait before polling again after a failed poll
+    SCOREBOARD_POLL_RETRY = timedelta(seconds=int(os.getenv("FLASK_SCOREBOARD_POLL_RETRY", "30")))
+    # how late the poller can be before the web workers stop trusting its snapshot and query ESPN themselves
+    SCOREBOARD_POLLER_GRACE = timedelta(seconds=int(os.getenv("FLASK_SCOREBOARD_POLLER_GRACE", "30")))
+
+    # SETTLEMENT (`flask pool worker`)
+    # how often to check whether every game of the week is over, and how long they must have been final for
+    SETTLEMENT_CHECK = timedelta(minutes=int(os.getenv("FLASK_SETTLEMENT_CHECK", "1")))
+    SETTLEMENT_GRACE = timedelta(minutes=int(os.getenv("FLASK_SETTLEMENT_GRACE", "10")))
+    # how long after its kickoff a game ESPN has as postponed (without a new date) stops holding up its week
+    SETTLEMENT_POSTPONED_GRACE = timedelta(hours=int(os.getenv("FLASK_SETTLEMENT_POSTPONED_GRACE", "24")))
+
+    # BACKFILL (`flask pool backfill`)
+    # how many weeks to query ESPN for at once; more than the ESPN client's 4 pooled connections won't help
+    BACKFILL_CONCURRENCY = int(os.getenv("FLASK_BACKFILL_CONCURRENCY", "4"))
+
+    # SCOREBOARD STREAM (`/stream/scoreboard`)
+    # where browsers stream the scoreboard from; only set it once that's served by async workers (see prod compose)
+    SCOREBOARD_STREAM_URL = os.getenv("FLASK_SCOREBOARD_STREAM_URL", None)
+    # whether this app serves the stream; only set it where it runs under async workers, since every open stream
+    # holds a sync worker for as long as the browser is connected
+    SCOREBOARD_STREAM_SERVE = os.getenv("FLASK_SCOREBOARD_STREAM_SERVE", "0") == "1"
+    # how often each worker's broadcaster checks the shared scoreboard for changes to send to browsers
+    SCOREBOARD_STREAM_CHECK = timedelta(seconds=int(os.getenv("FLASK_SCOREBOARD_STREAM_CHECK", "2")))
+    # how long a stream can be idle before a keepalive is sent, so that proxies don't close it
+    SCOREBOARD_STREAM_KEEPALIVE = timedelta(seconds=int(os.getenv("FLASK_SCOREBOARD_STREAM_KEEPALIVE", "15")))
+    # how many events can be waiting for a browser before it's dropped for falling behind
+    SCOREBOARD_STREAM_MAX_QUEUED = int(os.getenv("FLASK_SCOREBOARD_STREAM_MAX_QUEUED", "100"))
+
+    # INSTRUMENTATION
+    # time each phase of every request, reporting it in a `Server-Timing` header and a log line
+    REQUEST_TIMING = os.getenv("FLASK_REQUEST_TIMING", "1") == "1"
+    # a directory in which each container keeps its `PROMETHEUS_MULTIPROC_DIR`, so that `/metrics` sums up every
+    # container's metrics, including those of the poller and the scheduler, which don't serve HTTP (see prod compose)
+    METRICS_SHARED_DIR = os.getenv("FLASK_METRICS_SHARED_DIR", None)
+
+    # HEALTH CHECKS
+    # how long `/healthcheck/ready` waits on the database before reporting the worker as not ready, in seconds
+    HEALTHCHECK_TIMEOUT = timedelta(seconds=float(os.getenv("FLASK_HEALTHCHECK_TIMEOUT", "2")))
+
     # EMAIL CONFIGURATION
     MAIL_DEBUG = DEBUG
     MAIL_SERVER = os.getenv("FLASK_MAIL_SERVER", "localhost")
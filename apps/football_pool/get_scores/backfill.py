@@ -0,0 +1,278 @@
+"""Backfills a whole season's results from ESPN, settling any finished week that was missed.
+
+Weeks are only ever settled live, as "whatever week ESPN says is current", so a week missed while the worker was down
+is never settled. `backfill_season` queries ESPN for every week of the season (by its `dates`, `seasontype` and `week`
+parameters), with at most `BACKFILL_CONCURRENCY` queries at once, and settles each finished week that isn't settled
+yet, in order:
+
+- The pot of each missed regular season week follows from the week before it (read from the ledger, if it was
+  settled), the same rollover as a live settlement. So once a regular season week can't be settled, none after it
+  are, until it can be.
+- Winning games are inserted with `ON CONFLICT DO NOTHING`, and only the inserted ones are paid, so it's idempotent.
+- Everything is written in one transaction under the settlement lock, then the running totals are rebuilt from the
+  ledger (see `rebuild`), which also sets the pot for the current season.
+
+Weeks that were already settled are never re-decided, even if ESPN's results for them have since changed.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from flask import Flask, current_app
+from sqlalchemy import select
+
+from ..models import Owner, SettledWeek, db
+from ..years import get_current_season_start_year
+from .client import get_espn_client
+from .exceptions import ESPNUnavailableError
+from .leaderboard import refresh_season_leaderboard
+from .make_games import CurrentWeek, SeasonType
+from .query import DEFAULT_URL
+from .rebuild import RebuildReport, get_rollover_sequence, rebuild_season
+from .settlement import WeekKey, is_week_over, warn_about_called_off_games
+from .write_to_db import (
+    acquire_settlement_lock,
+    get_owners_by_team_id,
+    get_week_prizes,
+    get_winning_game_rows,
+    insert_winning_games,
+    pay_owners,
+    week_has_real_winners,
+)
+
+REGULAR_SEASON_WEEKS = 18
+POSTSEASON_WEEKS = 5
+PRO_BOWL_WEEK = 4
+
+SEASON_TYPE_PARAMS = {SeasonType.PRESEASON: 1, SeasonType.REGULAR_SEASON: 2, SeasonType.POSTSEASON: 3}
+"""ESPN's `seasontype` parameter for each season type."""
+
+
+@dataclass
+class BackfillReport:
+    """What `backfill_season` settled (or would have), and which weeks it couldn't."""
+
+    season_start_year: int
+    settled: list[WeekKey] = field(default_factory=list)
+    winning_games: int = 0
+    """How many winning games were inserted."""
+    skipped: dict[WeekKey, str] = field(default_factory=dict)
+    """The weeks that couldn't be settled, with why."""
+    rebuild: RebuildReport | None = None
+
+    def lines(self) -> list[str]:
+        """Describes the backfill, one line per week."""
+        lines = [f"Settled {season_type.name_str} week {week}." for _, season_type, week in self.settled]
+        lines.extend(
+            f"Skipped {season_type.name_str} week {week}: {reason}"
+            for (_, season_type, week), reason in self.skipped.items()
+        )
+        lines.append(f"{self.winning_games} winning game(s) written.")
+        if self.rebuild is not None:
+            lines.extend(self.rebuild.lines())
+        return lines
+
+
+def get_season_weeks(season_start_year: int) -> list[WeekKey]:
+    """Gets every week of the season in which something can be won, in order.
+
+    Args:
+        season_start_year (int): The year in which the season started.
+
+    Returns:
+        list[WeekKey]: The season's regular season and postseason weeks, without pro bowl week.
+    """
+    return [(season_start_year, SeasonType.REGULAR_SEASON, week) for week in range(1, REGULAR_SEASON_WEEKS + 1)] + [
+        (season_start_year, SeasonType.POSTSEASON, week)
+        for week in range(1, POSTSEASON_WEEKS + 1)
+        if week != PRO_BOWL_WEEK
+    ]
+
+
+def fetch_week(app: Flask, week_key: WeekKey, url: str = DEFAULT_URL) -> dict:
+    """Queries ESPN for a week's scoreboard. Runs in a backfill thread, so it pushes its own app context.
+
+    Args:
+        app (Flask): The app whose ESPN client to query through.
+        week_key (WeekKey): The week to query.
+        url (str, optional): The URL to query. Defaults to DEFAULT_URL.
+
+    Raises:
+        ESPNUnavailableError: If ESPN isn't returning any data.
+
+    Returns:
+        dict: The week's scoreboard.
+    """
+    season_start_year, season_type, week = week_key
+    params = {"dates": season_start_year, "seasontype": SEASON_TYPE_PARAMS[season_type], "week": week}
+    with app.app_context():
+        return get_espn_client().get_json(url=url, params=params)
+
+
+def fetch_season(week_keys: list[WeekKey], concurrency: int) -> tuple[dict[WeekKey, CurrentWeek], dict[WeekKey, str]]:
+    """Queries ESPN for the weeks concurrently, parsing each scoreboard as it arrives.
+
+    Args:
+        week_keys (list[WeekKey]): The weeks to query.
+        concurrency (int): How many queries can be sent at once.
+
+    Returns:
+        tuple[dict[WeekKey, CurrentWeek], dict[WeekKey, str]]: The parsed weeks, and why the others couldn't be.
+    """
+    app: Flask = current_app._get_current_object()  # type: ignore[attr-defined]
+    get_espn_client()  # created up front, so that the threads share it
+    weeks: dict[WeekKey, CurrentWeek] = {}
+    failed: dict[WeekKey, str] = {}
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="backfill") as executor:
+        futures = {executor.submit(fetch_week, app, week_key): week_key for week_key in week_keys}
+        for future in as_completed(futures):
+            week_key = futures[future]
+            try:
+                current_week = CurrentWeek.get_from_json(future.result())
+            except ESPNUnavailableError as error:
+                failed[week_key] = str(error)
+                continue
+            except (KeyError, IndexError, TypeError, ValueError) as error:
+                failed[week_key] = f"the scoreboard couldn't be parsed ({error!r})"
+                continue
+            if (current_week.season_type, current_week.week) != week_key[1:]:
+                # e.g. ESPN ignored the parameters, and returned the current week
+                failed[week_key] = f"ESPN returned {current_week.season_type.name_str} week {current_week.week}"
+            elif not is_week_over(current_week):
+                failed[week_key] = "not every game is over"
+            else:
+                weeks[week_key] = current_week
+    return weeks, failed
+
+
+def get_settled_weeks(season_start_year: int) -> set[WeekKey]:
+    """Gets the season's settled weeks.
+
+    Args:
+        season_start_year (int): The year in which the season started.
+
+    Returns:
+        set[WeekKey]: The settled weeks.
+    """
+    return {
+        (season_start_year, SeasonType(season_type), week)
+        for season_type, week in db.session.execute(
+            select(SettledWeek.season_type, SettledWeek.week).where(SettledWeek.season_start_year == season_start_year)
+        )
+    }
+
+
+def get_opening_pot(season_start_year: int) -> int:
+    """Gets the pot going into the season's first week, rolled over from the previous season's ledger.
+
+    Args:
+        season_start_year (int): The year in which the season started.
+
+    Returns:
+        int: The pot going into week 1.
+    """
+    previous_season = get_rollover_sequence(season_start_year - 1)
+    if not previous_season or previous_season[-1].owned:
+        return 10
+    return previous_season[-1].paid + 10
+
+
+def plan_backfill(
+    season_start_year: int,
+    weeks: dict[WeekKey, CurrentWeek],
+    settled: set[WeekKey],
+    owners_by_team_id: dict[int, Owner],
+) -> tuple[list[tuple[WeekKey, list[dict]]], dict[WeekKey, str]]:
+    """Gets the winning games of each finished week that isn't settled yet, rolling the pot over from week to week.
+
+    Args:
+        season_start_year (int): The year in which the season started.
+        weeks (dict[WeekKey, CurrentWeek]): The season's finished weeks.
+        settled (set[WeekKey]): The season's settled weeks.
+        owners_by_team_id (dict[int, Owner]): The season's owners, keyed by their team's ID.
+
+    Returns:
+        tuple[list[tuple[WeekKey, list[dict]]], dict[WeekKey, str]]: Each week to settle, in order, with the columns of
+            its winning games, and the finished regular season weeks that can't be, as the pot going into them isn't
+            known yet, with why.
+    """
+    plan: list[tuple[WeekKey, list[dict]]] = []
+    blocked: dict[WeekKey, str] = {}
+    if not weeks:
+        return plan, blocked
+    ledger = {week.week: week for week in get_rollover_sequence(season_start_year)}
+    pot = get_opening_pot(season_start_year)
+    gap: int | None = None  # the first regular season week that can't be settled
+    for week_key in get_season_weeks(season_start_year):
+        _, season_type, week = week_key
+        if week_key in settled:
+            if season_type == SeasonType.REGULAR_SEASON and week in ledger:
+                pot = 10 if ledger[week].owned else ledger[week].paid + 10
+            continue
+        current_week = weeks.get(week_key)
+        if current_week is None:
+            if season_type == SeasonType.REGULAR_SEASON and gap is None:
+                gap = week
+            continue
+        if season_type == SeasonType.REGULAR_SEASON and gap is not None:
+            blocked[week_key] = f"week {gap} isn't settled, so the pot going into this week isn't known"
+            continue
+        prizes = get_week_prizes(current_week, pot)
+        if season_type == SeasonType.REGULAR_SEASON:
+            pot = 10 if week_has_real_winners(prizes[0], owners_by_team_id) else pot + 10
+        warn_about_called_off_games(current_week)
+        plan.append((week_key, get_winning_game_rows(current_week, season_start_year, prizes)))
+    return plan, blocked
+
+
+def backfill_season(
+    season_start_year: int | None = None,
+    concurrency: int | None = None,
+    dry_run: bool = False,
+) -> BackfillReport:
+    """Settles every finished week of the season that isn't settled yet, from ESPN's scoreboards.
+
+    Args:
+        season_start_year (int | None): The year in which the season started. Defaults to the current season.
+        concurrency (int | None): How many queries can be sent to ESPN at once. Defaults to `BACKFILL_CONCURRENCY`.
+        dry_run (bool, optional): Whether to roll back rather than commit. Defaults to False.
+
+    Returns:
+        BackfillReport: What was settled, and which weeks couldn't be.
+    """
+    if season_start_year is None:
+        season_start_year = get_current_season_start_year()
+    if concurrency is None:
+        concurrency = current_app.config["BACKFILL_CONCURRENCY"]
+    report = BackfillReport(season_start_year=season_start_year)
+    season_weeks = get_season_weeks(season_start_year)
+    # ESPN is queried before the lock is taken, so that settlements aren't held up meanwhile
+    weeks, skipped = fetch_season(season_weeks, concurrency)
+
+    acquire_settlement_lock()
+    settled = get_settled_weeks(season_start_year)
+    plan, blocked = plan_backfill(season_start_year, weeks, settled, get_owners_by_team_id(season_start_year))
+    skipped |= blocked
+    # the weeks were fetched in whatever order ESPN answered in
+    report.skipped = {
+        week_key: skipped[week_key] for week_key in season_weeks if week_key in skipped and week_key not in settled
+    }
+    db.session.add_all(
+        SettledWeek(season_start_year=season_start_year, season_type=season_type, week=week)
+        for (_, season_type, week), _ in plan
+    )
+    inserted = insert_winning_games([row for _, rows in plan for row in rows])
+    pay_owners(season_start_year, inserted)
+    report.settled = [week_key for week_key, _ in plan]
+    report.winning_games = len(inserted)
+    if plan:
+        refresh_season_leaderboard(season_start_year)
+        report.rebuild = rebuild_season(season_start_year)
+
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    return report
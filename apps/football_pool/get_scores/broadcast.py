@@ -0,0 +1,228 @@
+"""Broadcasts changes to the live scoreboard to every browser connected to `/stream/scoreboard`.
+
+Each worker runs one broadcaster thread, which watches the shared scoreboard cache (filled by the poller) and turns
+every new snapshot into small events, which are fanned out to the queue of every subscribed browser:
+
+- `snapshot`: The whole week, sent when a browser connects and whenever the week changes.
+- `score`: A game's score changed.
+- `status`: A game's status changed (e.g. it kicked off, or went final).
+- `leaders`: The teams leading the pool for a WinningType changed.
+
+However many browsers are connected, ESPN is only queried by the poller (or, without it, once per cache TTL).
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Iterator
+
+from flask import Flask, current_app
+
+from ..models import db
+from .make_games import CurrentWeek, Game
+from .query import get_live_snapshot
+from .tracker import LeaderChange, LiveWinnerTracker
+
+KEEPALIVE = ": keepalive\n\n"
+"""An SSE comment, sent to idle browsers so that proxies don't close the connection."""
+
+
+@dataclass(frozen=True)
+class ScoreboardEvent:
+    """An event sent to the browsers streaming the scoreboard."""
+
+    event: str
+    data: dict
+
+    def encode(self) -> str:
+        """Encodes the event in the Server-Sent Events format.
+
+        Returns:
+            str: The encoded event.
+        """
+        return f"event: {self.event}\ndata: {json.dumps(self.data, separators=(',', ':'))}\n\n"
+
+
+def _game_id(game: Game) -> str:
+    return f"{game.away_team.abbreviation}@{game.home_team.abbreviation}"
+
+
+def _game_state(game: Game) -> dict:
+    return {
+        "game": _game_id(game),
+        "away_score": game.away_team_score,
+        "home_score": game.home_team_score,
+        "status": game.status,
+        "display_clock": game.display_clock,
+        "quarter": game.quarter,
+    }
+
+
+def _leaders_state(leader_change: LeaderChange) -> dict:
+    return {
+        "winning_type": leader_change.winning_type,
+        "leaders": sorted(team.abbreviation for team in leader_change.leaders),
+        "added": sorted(team.abbreviation for team in leader_change.added),
+        "removed": sorted(team.abbreviation for team in leader_change.removed),
+    }
+
+
+class Subscription:
+    """A browser's queue of encoded events."""
+
+    def __init__(self, max_queued: int) -> None:
+        self.queue: queue.Queue[str] = queue.Queue(maxsize=max_queued)
+        self.closed = False
+
+    def events(self, keepalive: timedelta) -> Iterator[str]:
+        """Yields the encoded events as they're published, with keepalives in between, until it's closed.
+
+        Args:
+            keepalive (timedelta): How long to wait for an event before sending a keepalive.
+
+        Yields:
+            str: The encoded events, or keepalives.
+        """
+        while not self.closed:
+            try:
+                yield self.queue.get(timeout=keepalive.total_seconds())
+            except queue.Empty:
+                yield KEEPALIVE
+
+
+class ScoreboardBroadcaster:
+    """Watches the scoreboard from a background thread, and publishes its changes to every subscription."""
+
+    def __init__(self, app: Flask, check_interval: timedelta, max_queued: int) -> None:
+        self._app = app
+        self._check_interval = check_interval.total_seconds()
+        self._max_queued = max_queued
+        self._lock = threading.Lock()
+        self._subscriptions: set[Subscription] = set()
+        self._thread: threading.Thread | None = None
+        # only touched by the broadcaster's thread
+        self._tracker = LiveWinnerTracker()
+        self._digest: str | None = None
+        self._week: tuple[str, int] | None = None
+        self._games: dict[str, dict] = {}
+        self._snapshot_event: ScoreboardEvent | None = None
+
+    @property
+    def num_subscriptions(self) -> int:
+        """How many browsers are streaming the scoreboard from this worker."""
+        return len(self._subscriptions)
+
+    def subscribe(self) -> Subscription:
+        """Subscribes a browser to the scoreboard's events, starting with a snapshot of the week.
+
+        Returns:
+            Subscription: The browser's subscription.
+        """
+        subscription = Subscription(self._max_queued)
+        with self._lock:
+            if self._snapshot_event is not None:
+                subscription.queue.put_nowait(self._snapshot_event.encode())
+            self._subscriptions.add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="scoreboard-broadcaster", daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Unsubscribes a browser, once it disconnects.
+
+        Args:
+            subscription (Subscription): The browser's subscription.
+        """
+        subscription.closed = True
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def _publish(self, events: list[ScoreboardEvent]) -> None:
+        encoded_events = [event.encode() for event in events]
+        with self._lock:
+            for subscription in list(self._subscriptions):
+                try:
+                    for encoded_event in encoded_events:
+                        subscription.queue.put_nowait(encoded_event)
+                except queue.Full:
+                    # the browser isn't keeping up, drop it so that it reconnects and starts from a snapshot
+                    current_app.logger.info("Dropping a scoreboard subscription that fell behind.")
+                    subscription.closed = True
+                    self._subscriptions.discard(subscription)
+
+    def _diff(self, current_week: CurrentWeek) -> list[ScoreboardEvent]:
+        update = self._tracker.update(current_week)
+        week = (current_week.season_type, current_week.week)
+        games = {_game_id(game): _game_state(game) for game in current_week.games}
+        events: list[ScoreboardEvent] = []
+        if week == self._week:
+            for game in update.changed_games:
+                old_state, new_state = self._games.get(_game_id(game)), games[_game_id(game)]
+                if old_state is None or old_state["status"] != new_state["status"]:
+                    events.append(ScoreboardEvent("status", new_state))
+                elif any(old_state[score] != new_state[score] for score in ("away_score", "home_score")):
+                    events.append(ScoreboardEvent("score", new_state))
+            events.extend(ScoreboardEvent("leaders", _leaders_state(change)) for change in update.leader_changes)
+        self._snapshot_event = ScoreboardEvent(
+            "snapshot",
+            {
+                "season_type": current_week.season_type,
+                "week": current_week.week,
+                "games": list(games.values()),
+                "leaders": {
+                    winning_type: sorted(team.abbreviation for team in leaders)
+                    for winning_type, leaders in self._tracker.leaders.items()
+                },
+            },
+        )
+        if week != self._week:
+            # a new week (or the first one), so everything changed
+            events = [self._snapshot_event]
+        self._week, self._games = week, games
+        return events
+
+    def check(self) -> None:
+        """Publishes the changes to the scoreboard since the last check, if there are any."""
+        snapshot, current_week = get_live_snapshot()
+        if snapshot.digest == self._digest:
+            return
+        self._digest = snapshot.digest
+        events = self._diff(current_week)
+        if events:
+            current_app.logger.debug("Broadcasting %s scoreboard events.", len(events))
+            self._publish(events)
+
+    def _run(self) -> None:
+        with self._app.app_context():
+            current_app.logger.info("Starting the scoreboard broadcaster.")
+            while True:
+                try:
+                    self.check()
+                except Exception:
+                    current_app.logger.exception("Failed to check the scoreboard for changes.")
+                finally:
+                    db.session.remove()
+                time.sleep(self._check_interval)
+
+
+def get_scoreboard_broadcaster() -> ScoreboardBroadcaster:
+    """Gets the scoreboard broadcaster for the current app, creating it on first use.
+
+    Returns:
+        ScoreboardBroadcaster: The app's scoreboard broadcaster.
+    """
+    broadcaster = current_app.extensions.get("scoreboard_broadcaster")
+    if broadcaster is None:
+        broadcaster = ScoreboardBroadcaster(
+            app=current_app._get_current_object(),  # type: ignore[attr-defined]
+            check_interval=current_app.config["SCOREBOARD_STREAM_CHECK"],
+            max_queued=current_app.config["SCOREBOARD_STREAM_MAX_QUEUED"],
+        )
+        current_app.extensions["scoreboard_broadcaster"] = broadcaster
+    return broadcaster
@@ -0,0 +1,354 @@
+"""A scoreboard cache shared by every gunicorn worker on the host.
+
+Snapshots of the raw ESPN JSON are stored as files in the `CACHE_DIR`, so every worker serves the same data.
+Refreshing is single-flight: an exclusive `flock` on a per-scoreboard lock file ensures that only one worker
+queries ESPN at a time, while the others keep serving the last snapshot (or wait for the first one).
+
+Refreshing is also stale-while-revalidate: the worker that takes the lock refreshes from a background thread and
+serves the expired snapshot meanwhile, so no request waits on ESPN unless there's nothing to serve. If ESPN is
+unavailable, the last good snapshot keeps being served until it's `SCOREBOARD_MAX_STALENESS` past due, after which
+requests wait for a refresh and `ESPNUnavailableError` surfaces if it fails.
+
+Each snapshot is split into a small metadata file (when it was fetched, its validators and the digest of its
+body) and a payload file named after that digest. Most refreshes find that the scoreboard didn't move, so only
+the metadata is rewritten and the workers never re-read (or re-parse) the large payload.
+
+When the scoreboard poller (`flask pool poll`) is running, it publishes snapshots stamped with the time of its
+next poll, and the workers serve those without ever querying ESPN themselves.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import IO, Callable
+
+from flask import Flask, current_app
+
+from ..metrics import CACHE_LOOKUPS
+from .exceptions import ESPNUnavailableError
+
+STALE_PAYLOAD_SECONDS = 60
+"""How long a replaced payload file is kept around, for workers that are still reading it."""
+LOCK_POLL_SECONDS = 0.05
+"""How often to retry the refresh lock, while waiting for another worker to publish the first snapshot."""
+
+
+@dataclass(frozen=True)
+class ScoreboardSnapshot:
+    """The JSON returned by ESPN at a point in time.
+
+    Snapshots published by the poller carry an `expires_at`, the time by which the poller will have replaced it.
+    """
+
+    payload: dict
+    digest: str
+    fetched_at: float
+    expires_at: float | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def age(self) -> float:
+        """How old the snapshot is.
+
+        Returns:
+            float: The number of seconds since the snapshot was fetched.
+        """
+        return time.time() - self.fetched_at
+
+    @property
+    def meta(self) -> dict:
+        """Everything about the snapshot but its payload.
+
+        Returns:
+            dict: The snapshot's metadata.
+        """
+        meta = asdict(self)
+        del meta["payload"]
+        return meta
+
+
+def scoreboard_key(url: str, params: dict) -> str:
+    """Creates a filesystem-safe cache key for a scoreboard query.
+
+    Args:
+        url (str): The URL being queried.
+        params (dict): The query parameters sent with the request.
+
+    Returns:
+        str: The cache key for the query.
+    """
+    query_str = json.dumps([url, sorted(params.items())])
+    return hashlib.sha1(query_str.encode("utf-8")).hexdigest()
+
+
+def _atomic_write_json(path: Path, obj: dict) -> None:
+    """Writes JSON to a file such that readers only ever see the old or the new file, never a partial one."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as outfile:
+            json.dump(obj, outfile)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def _wait_for_lock(lock_file: IO) -> None:
+    """Takes an exclusive lock on the file, waiting for it without blocking other (green) threads."""
+    while True:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return
+        except BlockingIOError:
+            # a blocking `flock` would stall every request of a gevent worker, not just this one
+            time.sleep(LOCK_POLL_SECONDS)
+
+
+class ScoreboardCache:
+    """A file-backed cache of ESPN scoreboard snapshots, with single-flight refreshes."""
+
+    def __init__(self, cache_dir: Path, ttl: timedelta, poller_grace: timedelta, max_staleness: timedelta) -> None:
+        self.cache_dir = cache_dir / "scoreboard"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl.total_seconds()
+        self.poller_grace = poller_grace.total_seconds()
+        self.max_staleness = max_staleness.total_seconds()
+        # only re-read the metadata when another worker has replaced it, and the payload when its digest changed
+        self._memo: dict[str, tuple[int, ScoreboardSnapshot]] = {}
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.meta.json"
+
+    def _payload_path(self, key: str, digest: str) -> Path:
+        return self.cache_dir / f"{key}.{digest}.payload.json"
+
+    def _lock_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.lock"
+
+    def read(self, key: str) -> ScoreboardSnapshot | None:
+        """Reads the latest snapshot published for the key, by any worker.
+
+        Args:
+            key (str): The cache key of the scoreboard.
+
+        Returns:
+            ScoreboardSnapshot | None: The latest snapshot, or None if there isn't one yet.
+        """
+        meta_path = self._meta_path(key)
+        try:
+            mtime_ns = meta_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        memo = self._memo.get(key)
+        if memo is not None and memo[0] == mtime_ns:
+            return memo[1]
+        with meta_path.open("r", encoding="utf-8") as infile:
+            meta = json.load(infile)
+        if memo is not None and memo[1].digest == meta["digest"]:
+            payload = memo[1].payload
+        else:
+            with self._payload_path(key, meta["digest"]).open("r", encoding="utf-8") as infile:
+                payload = json.load(infile)
+        snapshot = ScoreboardSnapshot(payload=payload, **meta)
+        self._memo[key] = (mtime_ns, snapshot)
+        return snapshot
+
+    def write(self, key: str, snapshot: ScoreboardSnapshot) -> None:
+        """Publishes a snapshot to every worker, atomically replacing the previous one.
+
+        The payload is only written if it changed since the previous snapshot.
+
+        Args:
+            key (str): The cache key of the scoreboard.
+            snapshot (ScoreboardSnapshot): The snapshot to publish.
+        """
+        payload_path = self._payload_path(key, snapshot.digest)
+        if payload_path.exists():
+            os.utime(payload_path)  # marks when it was last published, for the cleanup below
+        else:
+            _atomic_write_json(payload_path, snapshot.payload)
+        _atomic_write_json(self._meta_path(key), snapshot.meta)
+        for old_payload_path in self.cache_dir.glob(f"{key}.*.payload.json"):
+            if old_payload_path == payload_path:
+                continue
+            try:
+                if time.time() - old_payload_path.stat().st_mtime > STALE_PAYLOAD_SECONDS:
+                    old_payload_path.unlink()
+            except FileNotFoundError:
+                pass  # another process cleaned it up first
+
+    def overdue(self, snapshot: ScoreboardSnapshot) -> float:
+        """How long ago a snapshot expired.
+
+        Snapshots published by the poller expire once its next poll is overdue by more than the grace period,
+        all others once they're older than the TTL.
+
+        Args:
+            snapshot (ScoreboardSnapshot): The snapshot to check.
+
+        Returns:
+            float: The number of seconds since the snapshot expired, negative if it hasn't yet.
+        """
+        if snapshot.expires_at is not None:
+            return time.time() - (snapshot.expires_at + self.poller_grace)
+        return snapshot.age - self.ttl
+
+    def is_fresh(self, snapshot: ScoreboardSnapshot | None) -> bool:
+        """Whether a snapshot exists and hasn't expired.
+
+        Args:
+            snapshot (ScoreboardSnapshot | None): The snapshot to check.
+
+        Returns:
+            bool: Whether the snapshot can be served without a refresh.
+        """
+        return snapshot is not None and self.overdue(snapshot) < 0
+
+    def is_servable(self, snapshot: ScoreboardSnapshot | None) -> bool:
+        """Whether a snapshot exists and can still be served while it's refreshed, i.e. it isn't too stale.
+
+        Args:
+            snapshot (ScoreboardSnapshot | None): The snapshot to check.
+
+        Returns:
+            bool: Whether the snapshot can be served.
+        """
+        return snapshot is not None and self.overdue(snapshot) <= self.max_staleness
+
+    def status(self, key: str) -> dict:
+        """Describes the latest snapshot published for the key, from its metadata alone (e.g. for health checks).
+
+        Args:
+            key (str): The cache key of the scoreboard.
+
+        Returns:
+            dict: Whether there's a snapshot, and if so whether it's fresh (or still servable), how old it is and who
+                published it.
+        """
+        try:
+            with self._meta_path(key).open("r", encoding="utf-8") as infile:
+                meta = json.load(infile)
+        except FileNotFoundError:
+            return {"exists": False, "fresh": False, "servable": False}
+        snapshot = ScoreboardSnapshot(payload={}, **meta)
+        return {
+            "exists": True,
+            "fresh": self.is_fresh(snapshot),
+            "servable": self.is_servable(snapshot),
+            "age_seconds": round(snapshot.age, 1),
+            "from_poller": snapshot.expires_at is not None,
+        }
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        fetch: Callable[[ScoreboardSnapshot | None], ScoreboardSnapshot],
+        latest: ScoreboardSnapshot,
+        lock_file: IO,
+    ) -> None:
+        """Refreshes the snapshot from a background thread, which releases the refresh lock once it's done."""
+        app: Flask = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        def refresh() -> None:
+            with lock_file, app.app_context():
+                try:
+                    self.write(key, fetch(latest))
+                except ESPNUnavailableError as error:
+                    current_app.logger.warning("%s Serving the last scoreboard snapshot.", error)
+                except Exception:
+                    current_app.logger.exception("Failed to refresh the scoreboard.")
+
+        threading.Thread(target=refresh, name="scoreboard-refresh", daemon=True).start()
+
+    def get(
+        self,
+        key: str,
+        fetch: Callable[[ScoreboardSnapshot | None], ScoreboardSnapshot],
+        allow_stale: bool = True,
+    ) -> ScoreboardSnapshot:
+        """Gets the snapshot for the key, refreshing it via `fetch` if it has expired.
+
+        Only one worker refreshes at a time, from a background thread, and the expired snapshot is served meanwhile
+        (as it is by the other workers). If there's no snapshot that's still servable, this waits for the refresh.
+        If ESPN is unavailable, the expired snapshot keeps being served until it's too stale.
+
+        Args:
+            key (str): The cache key of the scoreboard.
+            fetch (Callable[[ScoreboardSnapshot | None], ScoreboardSnapshot]): Queries ESPN for a new snapshot,
+                given the expired one (if any) so that the query can be conditional.
+            allow_stale (bool, optional): Whether an expired snapshot can be served. If not, this waits for the
+                refresh, and ESPN being unavailable always raises. Defaults to True.
+
+        Raises:
+            ESPNUnavailableError: If ESPN is unavailable and there's no servable snapshot to fall back on.
+
+        Returns:
+            ScoreboardSnapshot: The latest snapshot of the scoreboard.
+        """
+        snapshot = self.read(key)
+        if self.is_fresh(snapshot):
+            CACHE_LOOKUPS.labels(cache="scoreboard", result="hit").inc()
+            return snapshot  # type: ignore[return-value]
+
+        lock_file = self._lock_path(key).open("a")
+        handed_off = False
+        try:
+            if not allow_stale or not self.is_servable(snapshot):
+                _wait_for_lock(lock_file)
+            else:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    current_app.logger.debug("Another worker is refreshing the scoreboard, serving last snapshot.")
+                    CACHE_LOOKUPS.labels(cache="scoreboard", result="stale").inc()
+                    return snapshot  # type: ignore[return-value]
+
+            # another worker may have published a snapshot while we waited for the lock
+            latest = self.read(key)
+            if self.is_fresh(latest):
+                CACHE_LOOKUPS.labels(cache="scoreboard", result="hit").inc()
+                return latest  # type: ignore[return-value]
+
+            if allow_stale and self.is_servable(latest):
+                current_app.logger.debug("Scoreboard snapshot expired, refreshing it from ESPN in the background.")
+                self._refresh_in_background(key, fetch, latest, lock_file)
+                handed_off = True  # the background refresh releases the lock
+                CACHE_LOOKUPS.labels(cache="scoreboard", result="stale").inc()
+                return latest  # type: ignore[return-value]
+
+            current_app.logger.debug("No servable scoreboard snapshot, refreshing it from ESPN.")
+            snapshot = fetch(latest)
+            CACHE_LOOKUPS.labels(cache="scoreboard", result="miss").inc()
+            self.write(key, snapshot)
+            return snapshot
+        finally:
+            if not handed_off:
+                lock_file.close()
+
+
+def get_scoreboard_cache() -> ScoreboardCache:
+    """Gets the scoreboard cache for the current app, creating it on first use.
+
+    Returns:
+        ScoreboardCache: The app's scoreboard cache.
+    """
+    cache = current_app.extensions.get("scoreboard_cache")
+    if cache is None:
+        cache = ScoreboardCache(
+            cache_dir=current_app.config["CACHE_DIR"],
+            ttl=current_app.config["SCOREBOARD_CACHE_TTL"],
+            poller_grace=current_app.config["SCOREBOARD_POLLER_GRACE"],
+            max_staleness=current_app.config["SCOREBOARD_MAX_STALENESS"],
+        )
+        current_app.extensions["scoreboard_cache"] = cache
+    return cache
@@ -0,0 +1,276 @@
+"""A resilient HTTP client for ESPN's API.
+
+Each worker keeps one client, whose pooled keep-alive session avoids a new TCP/TLS handshake per query.
+Requests are bounded by connect/read timeouts and retried with exponential backoff, and a circuit breaker
+stops querying ESPN altogether for a cooldown once it has failed repeatedly, so callers can fail fast
+and serve cached data instead.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from enum import StrEnum
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+from ..metrics import ESPN_ERRORS, ESPN_REQUEST_DURATION
+from .exceptions import ESPNUnavailableError, NoESPNDataError
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class BreakerState(StrEnum):
+    """The states of the circuit breaker guarding ESPN."""
+
+    CLOSED = "CLOSED"  # ESPN is healthy, requests are sent
+    OPEN = "OPEN"  # ESPN is failing, requests are refused until the cooldown passes
+    HALF_OPEN = "HALF_OPEN"  # the cooldown passed, a single trial request is sent
+
+
+@dataclass
+class ESPNClientStats:
+    """Counters describing how the client's queries to ESPN have gone."""
+
+    requests: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    short_circuits: int = 0
+    not_modified: int = 0
+    breaker_opens: int = 0
+    total_latency: float = 0.0
+    last_latency: float | None = None
+
+    @property
+    def mean_latency(self) -> float | None:
+        """The mean latency of every request sent to ESPN, in seconds."""
+        if not self.requests:
+            return None
+        return self.total_latency / self.requests
+
+
+@dataclass(frozen=True)
+class ESPNResponse:
+    """A response from ESPN. Has no JSON when a conditional query found that nothing changed."""
+
+    query_json: dict | None
+    digest: str | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        """Whether ESPN answered that nothing changed since the previous response."""
+        return self.query_json is None
+
+
+class ESPNClient:
+    """Queries ESPN through a pooled session, with timeouts, retries and a circuit breaker."""
+
+    def __init__(
+        self,
+        connect_timeout: float,
+        read_timeout: float,
+        max_retries: int,
+        retry_backoff: float,
+        breaker_threshold: int,
+        breaker_cooldown: timedelta,
+    ) -> None:
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown.total_seconds()
+
+        # retries are handled below, so that they're counted and the breaker sees every failure
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.stats = ESPNClientStats()
+        self._lock = threading.Lock()
+        self._breaker_state = BreakerState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+
+    def _current_breaker_state(self) -> BreakerState:
+        # must be called with the lock held
+        if self._breaker_state == BreakerState.OPEN and time.monotonic() - self._opened_at >= self.breaker_cooldown:
+            self._breaker_state = BreakerState.HALF_OPEN
+        return self._breaker_state
+
+    @property
+    def breaker_state(self) -> BreakerState:
+        """The current state of the circuit breaker, moving from OPEN to HALF_OPEN once the cooldown passes."""
+        with self._lock:
+            return self._current_breaker_state()
+
+    def _allow_request(self) -> bool:
+        # the state is read and the HALF_OPEN trial claimed under the same lock, so only one thread gets the trial
+        with self._lock:
+            state = self._current_breaker_state()
+            if state == BreakerState.OPEN:
+                self.stats.short_circuits += 1
+                ESPN_ERRORS.labels(kind="short_circuit").inc()
+                return False
+            if state == BreakerState.HALF_OPEN:
+                # only let a single trial request through; the rest fail fast until it succeeds
+                self._breaker_state = BreakerState.OPEN
+                self._opened_at = time.monotonic()
+            return True
+
+    def _record_latency(self, latency: float) -> None:
+        ESPN_REQUEST_DURATION.observe(latency)
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.total_latency += latency
+            self.stats.last_latency = latency
+
+    def _record_success(self) -> None:
+        with self._lock:
+            self.stats.successes += 1
+            self._consecutive_failures = 0
+            self._breaker_state = BreakerState.CLOSED
+
+    def _record_failure(self) -> None:
+        ESPN_ERRORS.labels(kind="failure").inc()
+        with self._lock:
+            self.stats.failures += 1
+            self._consecutive_failures += 1
+            if self._consecutive_failures < self.breaker_threshold:
+                return
+            if self._breaker_state == BreakerState.CLOSED:
+                self.stats.breaker_opens += 1
+                current_app.logger.warning(
+                    "ESPN failed %s times in a row, opening the breaker.", self._consecutive_failures
+                )
+            self._breaker_state = BreakerState.OPEN
+            self._opened_at = time.monotonic()
+
+    def _get_once(self, url: str, params: dict, headers: dict) -> ESPNResponse:
+        start_time = time.perf_counter()
+        try:
+            response = self.session.get(url=url, params=params, headers=headers, timeout=self.timeout)
+        finally:
+            self._record_latency(time.perf_counter() - start_time)
+        if response.status_code == 304:
+            with self._lock:
+                self.stats.not_modified += 1
+            return ESPNResponse(
+                query_json=None,
+                digest=None,
+                etag=response.headers.get("ETag", headers.get("If-None-Match")),
+                last_modified=response.headers.get("Last-Modified", headers.get("If-Modified-Since")),
+            )
+        response.raise_for_status()
+        query_json = response.json()
+        if not query_json:
+            raise NoESPNDataError(url=url)
+        return ESPNResponse(
+            query_json=query_json,
+            digest=hashlib.sha256(response.content).hexdigest(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    def get(self, url: str, params: dict, etag: str | None = None, last_modified: str | None = None) -> ESPNResponse:
+        """Queries ESPN, retrying failures with exponential backoff.
+
+        If validators from a previous response are given, the query is conditional and ESPN
+        may answer that nothing changed, in which case the response has no JSON.
+
+        Args:
+            url (str): The URL to query.
+            params (dict): The query parameters to send.
+            etag (str | None, optional): The ETag of the previous response. Defaults to None.
+            last_modified (str | None, optional): The Last-Modified of the previous response. Defaults to None.
+
+        Raises:
+            ESPNUnavailableError: If the breaker is open, or the query failed after all retries.
+
+        Returns:
+            ESPNResponse: ESPN's response.
+        """
+        headers = {}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+        if not self._allow_request():
+            raise ESPNUnavailableError(url=url, reason="the circuit breaker is open")
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._get_once(url=url, params=params, headers=headers)
+            except (requests.RequestException, ValueError, NoESPNDataError) as error:
+                retryable = not isinstance(error, requests.HTTPError) or (
+                    error.response is not None and error.response.status_code in RETRYABLE_STATUS_CODES
+                )
+                if retryable and attempt < self.max_retries:
+                    delay = self.retry_backoff * 2**attempt
+                    current_app.logger.info("Querying ESPN failed (%s), retrying in %ss.", error, delay)
+                    ESPN_ERRORS.labels(kind="retry").inc()
+                    with self._lock:
+                        self.stats.retries += 1
+                    time.sleep(delay)
+                    continue
+                self._record_failure()
+                raise ESPNUnavailableError(url=url, reason=str(error)) from error
+            self._record_success()
+            return response
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def get_json(self, url: str, params: dict) -> dict:
+        """Queries ESPN for JSON, unconditionally.
+
+        Args:
+            url (str): The URL to query.
+            params (dict): The query parameters to send.
+
+        Raises:
+            ESPNUnavailableError: If the breaker is open, or the query failed after all retries.
+
+        Returns:
+            dict: The JSON returned by ESPN.
+        """
+        return self.get(url=url, params=params).query_json  # type: ignore[return-value]
+
+    def stats_dict(self) -> dict:
+        """Gets the client's counters, for monitoring.
+
+        Returns:
+            dict: The client's counters, mean latency and breaker state.
+        """
+        breaker_state = self.breaker_state
+        with self._lock:
+            stats = asdict(self.stats)
+            stats["mean_latency"] = self.stats.mean_latency
+            stats["consecutive_failures"] = self._consecutive_failures
+        stats["breaker_state"] = breaker_state.value
+        return stats
+
+
+def get_espn_client() -> ESPNClient:
+    """Gets this worker's ESPN client for the current app, creating it on first use.
+
+    Returns:
+        ESPNClient: The app's ESPN client.
+    """
+    client = current_app.extensions.get("espn_client")
+    if client is None:
+        client = ESPNClient(
+            connect_timeout=current_app.config["ESPN_CONNECT_TIMEOUT"],
+            read_timeout=current_app.config["ESPN_READ_TIMEOUT"],
+            max_retries=current_app.config["ESPN_MAX_RETRIES"],
+            retry_backoff=current_app.config["ESPN_RETRY_BACKOFF"],
+            breaker_threshold=current_app.config["ESPN_BREAKER_THRESHOLD"],
+            breaker_cooldown=current_app.config["ESPN_BREAKER_COOLDOWN"],
+        )
+        current_app.extensions["espn_client"] = client
+    return client
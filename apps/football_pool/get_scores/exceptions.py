@@ -17,3 +17,10 @@ class GameTiedError(ValueError):
 
     def __init__(self) -> None:
         super().__init__("Cannot compute a winner for a tied game.")
+
+
+class ESPNUnavailableError(Exception):
+    """An exception for when ESPN is failing, so its data can't be retrieved (or isn't even requested)."""
+
+    def __init__(self, url: str, reason: str) -> None:
+        super().__init__(f'ESPN is unavailable when querying "{url=}": {reason}')
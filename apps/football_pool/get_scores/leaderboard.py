@@ -0,0 +1,60 @@
+"""Keeps the `season_leaderboard` table in sync with the `WinningGame` ledger.
+
+Each owner's totals, win counts and rank are recomputed from the winning games by a single `INSERT ... SELECT`,
+inside the caller's transaction, so the leaderboard always matches the games committed alongside it.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import delete, func, insert, select
+
+from ..models import LeaderboardEntry, Owner, WinningGame, WinningType, db
+from ..page_cache import mark_season_changed
+
+WIN_COUNT_COLUMNS = {
+    WinningType.MOST: "most_wins",
+    WinningType.LEAST: "least_wins",
+    WinningType.FIFTY: "fifty_wins",
+    WinningType.PLAYOFF: "playoff_wins",
+    WinningType.SUPER_BOWL: "super_bowl_wins",
+}
+
+
+def refresh_season_leaderboard(season_start_year: int) -> None:
+    """Recomputes the season's leaderboard from its winning games. Doesn't commit, the caller does.
+
+    Every owner of the season gets an entry, ranked by their total winnings (ties share a rank).
+
+    Args:
+        season_start_year (int): The year in which the season started.
+    """
+    total_winnings = func.coalesce(func.sum(WinningGame.winnings), 0)
+    win_counts = [
+        func.count(WinningGame.id).filter(WinningGame.winning_type == winning_type)
+        for winning_type in WIN_COUNT_COLUMNS
+    ]
+    standings = (
+        select(
+            Owner.id,
+            Owner.season_start_year,
+            total_winnings,
+            *win_counts,
+            func.rank().over(order_by=total_winnings.desc()),
+        )
+        .select_from(Owner)
+        .outerjoin(
+            WinningGame,
+            (WinningGame.team_id == Owner.team_id) & (WinningGame.season_start_year == Owner.season_start_year),
+        )
+        .where(Owner.season_start_year == season_start_year)
+        .group_by(Owner.id, Owner.season_start_year)
+    )
+    db.session.flush()  # make sure the ledger includes any pending winning games
+    db.session.execute(delete(LeaderboardEntry).where(LeaderboardEntry.season_start_year == season_start_year))
+    db.session.execute(
+        insert(LeaderboardEntry).from_select(
+            ["owner_id", "season_start_year", "winnings", *WIN_COUNT_COLUMNS.values(), "rank"],
+            standings,
+        )
+    )
+    mark_season_changed(db.session(), season_start_year)  # bulk statements don't flag the season themselves
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from enum import StrEnum
-from typing import Callable
+from typing import TYPE_CHECKING
 
 from flask import current_app
 from pydantic import ConfigDict
@@ -10,85 +10,14 @@ from pydantic.dataclasses import dataclass
 from pytz import timezone
 
 from ..models import Team, WinningType
+from ..timing import timed
 from .exceptions import GameNotOverError, GameTiedError
+from .teams import get_team
 
-EST = timezone("US/Eastern")
-
-
-def find_teams_with_most_points(current_week: CurrentWeek) -> list[Team]:
-    """Finds the teams that scored the most points in the current week.
-
-    Args:
-        current_week (CurrentWeek): The CurrentWeek containing scores of Game objects.
-
-    Returns:
-        list[Team]: A list of Team objects that scored the most points.
-    """
-    not_queued_games = [game for game in current_week.games if game.status != GameStatus.QUEUED]
-    if not not_queued_games:
-        most_points = 0
-    else:
-        most_points = max(game.max_score for game in not_queued_games)
-    current_app.logger.debug("The most points scored in the week is %s.", most_points)
-    winning_teams: list[Team] = []
-    for game in current_week.games:
-        if game.home_team_score == most_points:
-            winning_teams.append(game.home_team)
-        if game.away_team_score == most_points:
-            winning_teams.append(game.away_team)
-    current_app.logger.debug("%s team(s) scored the most points this week.", len(winning_teams))
-    return winning_teams
-
-
-def find_teams_with_least_points(current_week: CurrentWeek) -> list[Team]:
-    """Finds the teams that scored the least points in the current week.
-
-    Args:
-        current_week (CurrentWeek): The CurrentWeek containing scores of Game objects.
-
-    Returns:
-        list[Team]: A list of Team objects that scored the least points.
-    """
-    not_queued_games = [game for game in current_week.games if game.status != GameStatus.QUEUED]
-    if not not_queued_games:
-        least_points = 0
-    else:
-        least_points = min(game.min_score for game in not_queued_games)
-    current_app.logger.debug("The least points scored in the week is %s.", least_points)
-    winning_teams: list[Team] = []
-    for game in current_week.games:
-        if game.home_team_score == least_points:
-            winning_teams.append(game.home_team)
-        if game.away_team_score == least_points:
-            winning_teams.append(game.away_team)
-    current_app.logger.debug("%s team(s) scored the least points this week.", len(winning_teams))
-    return winning_teams
-
-
-def find_teams_with_fifty_points(current_week: CurrentWeek) -> list[Team]:
-    """Finds the teams that scored fifty in the current week.
-
-    Args:
-        current_week (CurrentWeek): The CurrentWeek containing scores of Game objects.
-
-    Returns:
-        list[Team]: A list of Team objects that scored fifty points.
-    """
-    winning_teams: list[Team] = []
-    for game in current_week.games:
-        if game.home_team_score == 50:
-            winning_teams.append(game.home_team)
-        if game.away_team_score == 50:
-            winning_teams.append(game.away_team)
-    current_app.logger.debug("%s team(s) scored fifty points this week.", len(winning_teams))
-    return winning_teams
+if TYPE_CHECKING:
+    from .winners import WeekWinners
 
-
-WINNING_TEAM_FUNC_MAP: dict[WinningType, Callable[[CurrentWeek], list[Team]]] = {
-    WinningType.MOST: find_teams_with_most_points,
-    WinningType.LEAST: find_teams_with_least_points,
-}
-"""Maps the MOST and LEAST WinningTypes to functions to retrieve winners for the current week."""
+EST = timezone("US/Eastern")
 
 
 class SeasonType(StrEnum):
@@ -108,6 +37,15 @@ class SeasonType(StrEnum):
             return SeasonType.POSTSEASON
         raise ValueError
 
+    @property
+    def name_str(self) -> str:
+        """Displays the SeasonType as a formatted string.
+
+        Returns:
+            str: A formatted string for the SeasonType.
+        """
+        return self.value.replace("_", " ").title()
+
 
 class GameStatus(StrEnum):
     """An Enum class that handles the status of games."""
@@ -116,6 +54,9 @@ class GameStatus(StrEnum):
     IN_PROGRESS = "STATUS_IN_PROGRESS"
     HALFTIME = "STATUS_HALFTIME"
     FINAL = "STATUS_FINAL"
+    # called off: a canceled game is never played, a postponed one is played on a date ESPN hasn't set yet
+    CANCELED = "STATUS_CANCELED"
+    POSTPONED = "STATUS_POSTPONED"
 
     @classmethod
     def _missing_(cls, value: str) -> GameStatus:  # pyright: ignore[reportIncompatibleMethodOverride]
@@ -131,6 +72,9 @@ class GameStatus(StrEnum):
         return GameStatus.IN_PROGRESS
 
 
+CALLED_OFF_STATUSES = frozenset({GameStatus.CANCELED, GameStatus.POSTPONED})
+
+
 @dataclass(config=ConfigDict(arbitrary_types_allowed=True))
 class Game:
     """Contains all of the information about a single game currently being played.
@@ -168,9 +112,9 @@ class Game:
             gametime = gametime.astimezone(EST)
             games.append(
                 Game(
-                    home_team=Team.from_abbr(home_dict["team"]["abbreviation"]),
+                    home_team=get_team(home_dict["team"]["abbreviation"]),
                     home_team_score=int(home_dict["score"]),
-                    away_team=Team.from_abbr(away_dict["team"]["abbreviation"]),
+                    away_team=get_team(away_dict["team"]["abbreviation"]),
                     away_team_score=int(away_dict["score"]),
                     espn_url=event["links"][0]["href"],
                     gametime=gametime,
@@ -208,6 +152,15 @@ class Game:
         """
         return self.status == GameStatus.FINAL
 
+    @property
+    def is_called_off(self) -> bool:
+        """Returns True if the game was canceled or postponed, otherwise returns False.
+
+        Returns:
+            bool: Whether the game was called off.
+        """
+        return self.status in CALLED_OFF_STATUSES
+
     @property
     def is_queued(self) -> bool:
         """Returns True if the game is queued, otherwise returns False.
@@ -272,13 +225,13 @@ class Game:
         """Computes the game's winner. Should only be called when the game is not tied!
 
         Raises:
-            GameNotOverError: If the game isn't over yet.
+            GameNotOverError: If the game isn't over yet, or was called off.
             GameTiedError: If the game is tied.
 
         Returns:
             Team: The team that won the game.
         """
-        if self.display_clock != "0:00":
+        if self.is_called_off or self.display_clock != "0:00":
             raise GameNotOverError()
         if self.home_team_score == self.away_team_score:
             raise GameTiedError()
@@ -322,27 +275,6 @@ class CurrentWeek:
         current_app.logger.debug("It's an EVEN week, so it's a LEAST points week.")
         return WinningType.LEAST
 
-    def get_weekly_winning_teams(self) -> list[Team]:
-        """Gets the most or least winners for the current week.
-
-        Returns:
-            list[Team]: A list of winning teams.
-        """
-        if not self.is_regular_season:
-            current_app.logger.debug(
-                "It's not a regular season week, so there are no most or least winners. Returning empty list."
-            )
-            return []
-        return WINNING_TEAM_FUNC_MAP[self.winning_type](self)
-
-    def get_fifty_point_winners(self) -> list[Team]:
-        """Gets the fifty point-scoring teams for the current week.
-
-        Returns:
-            list[Team]: A list of winning teams.
-        """
-        return find_teams_with_fifty_points(self)
-
     @property
     def is_preseason(self) -> bool:
         """Returns whether the current week is a preseason week or not.
@@ -413,54 +345,16 @@ class CurrentWeek:
         """Whether the current week is a regular season week."""
         return not self.is_preseason and not self.is_postseason
 
-    def get_postseason_winners(self) -> list[Team]:
-        """Gets the postseason winners, if the week if a postseason week.
+    def get_winners(self) -> WeekWinners:
+        """Computes the week's winners for every WinningType, in a single pass over the games.
 
         Returns:
-            list[Team]: The list of Teams that won a postseason game this week.
+            WeekWinners: The week's winners.
         """
-        if not self.is_postseason:
-            current_app.logger.debug("It's not the postseason. Returning an empty list.")
-            return []
-        winning_teams: list[Team] = []
-        for game in self.games:
-            try:
-                winner = game.winning_team
-            except GameNotOverError:
-                current_app.logger.debug(
-                    "%s @ %s is not over. Skipping.",
-                    game.away_team.abbreviation,
-                    game.home_team.abbreviation,
-                )
-                continue
-            current_app.logger.debug(
-                "%s won a postseason game! Congrats, unless they're an AFCN team that isn't the Steelers.",
-                winner.abbreviation,
-            )
-            winning_teams.append(winner)
-        return winning_teams
+        from .winners import compute_week_winners
 
-    def get_super_bowl_winners(self) -> list[Team]:
-        """Gets the Super Bowl winners, if the week is Super Bowl week.
-
-        Returns a list (despite there only ever being one winner) since other methods return a list.
-        This makes it easier to treat the winners equally later on.
-
-        Returns:
-            list[Team]: The list of Teams that won the Super Bowl this week.
-        """
-        if not self.is_super_bowl:
-            current_app.logger.debug("It's not Super Bowl week. Returning an empty list.")
-            return []
-        winning_teams: list[Team] = []
-        for game in self.games:
-            winner = game.winning_team
-            current_app.logger.debug(
-                "%s won the Super Bowl. If the Steelers just won, I'll definitely be crying right now.",
-                winner.abbreviation,
-            )
-            winning_teams.append(winner)
-        return winning_teams
+        with timed("winners"):
+            return compute_week_winners(self)
 
     def get_pool_winning_teams(self) -> set[Team]:
         """Returns all teams that are currently winning the football pool.
@@ -468,13 +362,7 @@ class CurrentWeek:
         Returns:
             set[Team]: A set of Teams that are currently winning the football pool.
         """
-        winning_team_funcs: tuple[Callable[[], list[Team]], ...] = (
-            self.get_weekly_winning_teams,
-            self.get_fifty_point_winners,
-            self.get_postseason_winners,
-            self.get_super_bowl_winners,
-        )
-        return set(team for winning_team_func in winning_team_funcs for team in winning_team_func())
+        return self.get_winners().pool_winning_teams
 
     @staticmethod
     def get_from_json(query_json: dict) -> CurrentWeek:
@@ -0,0 +1,97 @@
+"""A background poller that keeps the shared scoreboard snapshot up to date.
+
+Run it as its own process with `flask pool poll`. It polls ESPN on a cadence derived from the status of
+the current week's games and publishes each snapshot for the web workers, which then never query ESPN.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from ..models import db
+from .cache import get_scoreboard_cache, scoreboard_key
+from .make_games import EST, CurrentWeek
+from .query import DEFAULT_PARAMS, DEFAULT_URL, fetch_scoreboard, parse_snapshot
+from .tracker import LiveWinnerTracker
+
+
+def get_poll_interval(current_week: CurrentWeek) -> timedelta:
+    """Gets how long to wait before polling ESPN again, based on the status of the week's games.
+
+    - Any game being played -> `SCOREBOARD_POLL_LIVE` (seconds).
+    - Any game queued -> `SCOREBOARD_POLL_QUEUED` (minutes), or sooner if a game kicks off before then.
+    - Every game final -> `SCOREBOARD_POLL_FINAL` (hourly).
+
+    Args:
+        current_week (CurrentWeek): The most recently polled week.
+
+    Returns:
+        timedelta: How long to wait before the next poll.
+    """
+    live_interval: timedelta = current_app.config["SCOREBOARD_POLL_LIVE"]
+    if any(game.is_in_progress or game.is_in_halftime for game in current_week.games):
+        return live_interval
+    queued_gametimes = [game.gametime for game in current_week.games if game.is_queued]
+    if queued_gametimes:
+        until_kickoff = min(queued_gametimes) - datetime.now(tz=EST)
+        return max(live_interval, min(current_app.config["SCOREBOARD_POLL_QUEUED"], until_kickoff))
+    return current_app.config["SCOREBOARD_POLL_FINAL"]
+
+
+def poll_once(
+    url: str = DEFAULT_URL,
+    params: dict = DEFAULT_PARAMS,
+    tracker: LiveWinnerTracker | None = None,
+) -> timedelta:
+    """Polls ESPN once and publishes the snapshot, stamped with the time of the next poll.
+
+    The poll is conditional on the previous snapshot, and the week is only re-parsed if the scoreboard moved.
+
+    Args:
+        url (str, optional): The URL to query. Defaults to DEFAULT_URL.
+        params (dict, optional): The query parameters to send. Defaults to DEFAULT_PARAMS.
+        tracker (LiveWinnerTracker | None, optional): Tracks the pool's leaders across polls. Defaults to None.
+
+    Returns:
+        timedelta: How long to wait before the next poll.
+    """
+    cache = get_scoreboard_cache()
+    key = scoreboard_key(url, params)
+    snapshot = fetch_scoreboard(url=url, params=params, previous=cache.read(key))
+    current_week = parse_snapshot(key, snapshot)
+    if tracker is not None:
+        for leader_change in tracker.update(current_week).leader_changes:
+            current_app.logger.info(
+                "%s leaders changed to %s.",
+                leader_change.winning_type.name_str,
+                sorted(team.abbreviation for team in leader_change.leaders),
+            )
+    interval = get_poll_interval(current_week)
+    cache.write(key, replace(snapshot, expires_at=snapshot.fetched_at + interval.total_seconds()))
+    return interval
+
+
+def poll_scoreboard(url: str = DEFAULT_URL, params: dict = DEFAULT_PARAMS) -> None:
+    """Polls ESPN forever, publishing every snapshot. Must be run within an app context.
+
+    Args:
+        url (str, optional): The URL to query. Defaults to DEFAULT_URL.
+        params (dict, optional): The query parameters to send. Defaults to DEFAULT_PARAMS.
+    """
+    current_app.logger.info("Starting the scoreboard poller.")
+    tracker = LiveWinnerTracker()
+    while True:
+        try:
+            interval = poll_once(url=url, params=params, tracker=tracker)
+        except Exception:
+            current_app.logger.exception("Failed to poll the scoreboard, retrying soon.")
+            interval = current_app.config["SCOREBOARD_POLL_RETRY"]
+        finally:
+            # don't hang on to a database connection while sleeping
+            db.session.remove()
+        current_app.logger.debug("Polling the scoreboard again in %s.", interval)
+        time.sleep(interval.total_seconds())
@@ -1,22 +1,142 @@
-import requests
+import time
+from dataclasses import replace
 
-from .exceptions import NoESPNDataError
+from flask import current_app
+
+from ..timing import timed
+from .cache import ScoreboardSnapshot, get_scoreboard_cache, scoreboard_key
+from .client import get_espn_client
+from .exceptions import ESPNUnavailableError
 from .make_games import CurrentWeek
 
 DEFAULT_URL = "http://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard"
 DEFAULT_PARAMS = {}
 
+_PARSED_WEEKS: dict[str, tuple[str, CurrentWeek]] = {}
+"""The last CurrentWeek parsed by this worker for each scoreboard key, along with the digest it was parsed from."""
 
-def get_live_scores(url: str = DEFAULT_URL, params: dict = DEFAULT_PARAMS) -> CurrentWeek:
-    query_json = requests.get(url=url, params=params).json()
-    if not query_json:
-        raise NoESPNDataError(url=url)
-    return CurrentWeek.get_from_json(query_json)
 
+def fetch_scoreboard(
+    url: str = DEFAULT_URL,
+    params: dict = DEFAULT_PARAMS,
+    previous: ScoreboardSnapshot | None = None,
+) -> ScoreboardSnapshot:
+    """Queries ESPN for a new scoreboard snapshot through this worker's ESPN client, bypassing the cache.
 
-if __name__ == "__main__":
-    import time
+    If there's a previous snapshot, the query is conditional on its validators, and its payload is reused
+    if ESPN answers that nothing changed (or returns the exact same body). A new payload is parsed before it's
+    returned, so that a malformed one is never published over the last good snapshot.
+
+    Args:
+        url (str, optional): The URL to query. Defaults to DEFAULT_URL.
+        params (dict, optional): The query parameters to send. Defaults to DEFAULT_PARAMS.
+        previous (ScoreboardSnapshot | None, optional): The previous snapshot of the scoreboard. Defaults to None.
+
+    Raises:
+        ESPNUnavailableError: If ESPN isn't returning any (valid) data, or is being skipped while it's failing.
+
+    Returns:
+        ScoreboardSnapshot: The new snapshot of the scoreboard.
+    """
+    with timed("espn"):
+        response = get_espn_client().get(
+            url=url,
+            params=params,
+            etag=previous.etag if previous is not None else None,
+            last_modified=previous.last_modified if previous is not None else None,
+        )
+    fetched_at = time.time()
+    if previous is not None and (response.not_modified or response.digest == previous.digest):
+        current_app.logger.debug("The scoreboard hasn't changed since the previous snapshot.")
+        return replace(
+            previous,
+            fetched_at=fetched_at,
+            expires_at=None,
+            etag=response.etag,
+            last_modified=response.last_modified,
+        )
+    snapshot = ScoreboardSnapshot(
+        payload=response.query_json,  # type: ignore[arg-type]
+        digest=response.digest,  # type: ignore[arg-type]
+        fetched_at=fetched_at,
+        etag=response.etag,
+        last_modified=response.last_modified,
+    )
+    try:
+        parse_snapshot(scoreboard_key(url, params), snapshot)
+    except (KeyError, IndexError, TypeError, ValueError) as error:
+        raise ESPNUnavailableError(url=url, reason=f"the scoreboard couldn't be parsed ({error!r})") from error
+    return snapshot
+
+
+def parse_snapshot(key: str, snapshot: ScoreboardSnapshot) -> CurrentWeek:
+    """Parses the CurrentWeek from a snapshot, reusing the previous parse if the scoreboard hasn't moved.
+
+    Args:
+        key (str): The cache key of the scoreboard.
+        snapshot (ScoreboardSnapshot): The snapshot to parse.
+
+    Returns:
+        CurrentWeek: The CurrentWeek of the snapshot.
+    """
+    parsed = _PARSED_WEEKS.get(key)
+    if parsed is not None and parsed[0] == snapshot.digest:
+        return parsed[1]
+    with timed("parse"):
+        current_week = CurrentWeek.get_from_json(snapshot.payload)
+    _PARSED_WEEKS[key] = (snapshot.digest, current_week)
+    return current_week
+
+
+def get_live_snapshot(
+    url: str = DEFAULT_URL,
+    params: dict = DEFAULT_PARAMS,
+    allow_stale: bool = True,
+) -> tuple[ScoreboardSnapshot, CurrentWeek]:
+    """Gets the latest scoreboard snapshot, served from the scoreboard cache shared by all workers, and its parse.
 
+    Args:
+        url (str, optional): The URL to query. Defaults to DEFAULT_URL.
+        params (dict, optional): The query parameters to send. Defaults to DEFAULT_PARAMS.
+        allow_stale (bool, optional): Whether the last good snapshot can be served while it's being refreshed, or
+            while ESPN is unavailable. Defaults to True.
+
+    Raises:
+        ESPNUnavailableError: If ESPN is unavailable and there's no servable snapshot to fall back on.
+
+    Returns:
+        tuple[ScoreboardSnapshot, CurrentWeek]: The latest scoreboard snapshot, and the CurrentWeek parsed from it.
+    """
+    key = scoreboard_key(url, params)
+    with timed("scoreboard"):
+        snapshot = get_scoreboard_cache().get(
+            key=key,
+            fetch=lambda previous: fetch_scoreboard(url=url, params=params, previous=previous),
+            allow_stale=allow_stale,
+        )
+    return snapshot, parse_snapshot(key, snapshot)
+
+
+def get_live_scores(url: str = DEFAULT_URL, params: dict = DEFAULT_PARAMS, allow_stale: bool = True) -> CurrentWeek:
+    """Gets the live scores, served from the scoreboard cache shared by all workers.
+
+    Args:
+        url (str, optional): The URL to query. Defaults to DEFAULT_URL.
+        params (dict, optional): The query parameters to send. Defaults to DEFAULT_PARAMS.
+        allow_stale (bool, optional): Whether the last good scores can be served while they're being refreshed, or
+            while ESPN is unavailable. Defaults to True.
+
+    Raises:
+        ESPNUnavailableError: If ESPN is unavailable and there's no servable snapshot to fall back on.
+
+    Returns:
+        CurrentWeek: The CurrentWeek parsed from the latest scoreboard snapshot.
+    """
+    _, current_week = get_live_snapshot(url=url, params=params, allow_stale=allow_stale)
+    return current_week
+
+
+if __name__ == "__main__":
     from ...football_pool import create_app
 
     app = create_app()
@@ -32,6 +152,7 @@ if __name__ == "__main__":
     # import json
     # from pathlib import Path
 
+    # import requests
     # query_json = requests.get(DEFAULT_URL, DEFAULT_PARAMS).json()
 
     # with Path("/workspace/cur_week_output.json").open("w", encoding="utf-8") as outfile:
@@ -0,0 +1,192 @@
+"""Rebuilds the running totals (`Owner.winnings` and the `Pot`) from the `WinningGame` ledger.
+
+Settling a week updates the totals incrementally, so a bug, a failed deploy or an edit by hand can make them drift
+from the ledger. `check_season` compares them with the ledger, and `rebuild_season` (`flask pool rebuild`) sets them
+from it, with set-based SQL inside the caller's transaction:
+
+- Each owner's balance is the sum of their team's winning games in the season.
+- The pot rollover sequence is read from the regular season's MOST/LEAST games: the pot is reset to 10 after a week
+  won by an owned team, and grows by 10 after a week that wasn't. The pot after the last settled week is the pot.
+
+The ledger itself is never changed. A week whose pot doesn't follow from the week before is only reported.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from sqlalchemy import Row, ScalarSelect, case, func, select, update
+
+from ..models import Owner, Pot, WinningGame, WinningType, db
+from ..page_cache import mark_season_changed
+from ..years import get_current_season_start_year
+from .make_games import SeasonType
+
+
+@dataclass
+class BalanceChange:
+    """An owner whose balance didn't match the ledger."""
+
+    owner_id: int
+    name: str
+    before: int
+    after: int
+
+
+@dataclass
+class RolloverBreak:
+    """A week whose pot doesn't follow from the week before it."""
+
+    week: int
+    paid: int
+    expected: int
+
+
+@dataclass
+class RebuildReport:
+    """What `rebuild_season` changed (or would have, or `check_season` found), compared to the running totals."""
+
+    season_start_year: int
+    balances: list[BalanceChange] = field(default_factory=list)
+    pot: tuple[int, int] | None = None
+    """The pot before and after, if it changed."""
+    rollover_breaks: list[RolloverBreak] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        """Whether any running total was out of sync with the ledger."""
+        return bool(self.balances) or self.pot is not None
+
+    def lines(self) -> list[str]:
+        """Describes the differences, one per line."""
+        lines = [f"{change.name}: {change.before} -> {change.after}" for change in self.balances]
+        if self.pot is not None:
+            lines.append(f"Pot: {self.pot[0]} -> {self.pot[1]}")
+        lines.extend(
+            f"Week {week.week} paid {week.paid}, but the rollover from the week before makes it {week.expected}"
+            for week in self.rollover_breaks
+        )
+        return lines
+
+
+def get_ledger_total() -> ScalarSelect[int]:
+    """Gets the total winnings in the ledger of the owner's team, as a subquery correlated with `Owner`."""
+    return (
+        select(func.coalesce(func.sum(WinningGame.winnings), 0))
+        .where(WinningGame.season_start_year == Owner.season_start_year, WinningGame.team_id == Owner.team_id)
+        .scalar_subquery()
+    )
+
+
+def get_balance_changes(season_start_year: int) -> list[BalanceChange]:
+    """Gets each of the season's owners whose balance isn't their team's total winnings in the ledger.
+
+    Args:
+        season_start_year (int): The year in which the season started.
+
+    Returns:
+        list[BalanceChange]: The owners whose balance is out of sync, with what it should be.
+    """
+    ledger_total = get_ledger_total()
+    return [
+        BalanceChange(owner_id=owner_id, name=f"{first_name} {last_name}", before=before, after=after)
+        for owner_id, first_name, last_name, before, after in db.session.execute(
+            select(Owner.id, Owner.first_name, Owner.last_name, Owner.winnings, ledger_total)
+            .where(Owner.season_start_year == season_start_year, Owner.winnings != ledger_total)
+            .order_by(Owner.id)
+        )
+    ]
+
+
+def get_rollover_sequence(season_start_year: int) -> list[Row]:
+    """Gets the pot paid in each of the season's regular season weeks, with what it should have been.
+
+    Args:
+        season_start_year (int): The year in which the season started.
+
+    Returns:
+        list[Row]: A row per week, in order, with its `week`, the pot it `paid`, whether it was `owned` (won by an owned
+            team) and the pot `expected` from the week before (`None` for the first week).
+    """
+    weeks = (
+        select(
+            WinningGame.week,
+            func.max(WinningGame.winnings).label("paid"),
+            func.max(case((Owner.id.is_not(None), 1), else_=0)).label("owned"),
+        )
+        .outerjoin(
+            Owner,
+            (Owner.team_id == WinningGame.team_id) & (Owner.season_start_year == WinningGame.season_start_year),
+        )
+        .where(
+            WinningGame.season_start_year == season_start_year,
+            WinningGame.season_type == SeasonType.REGULAR_SEASON,
+            WinningGame.winning_type.in_([WinningType.MOST, WinningType.LEAST]),
+        )
+        .group_by(WinningGame.week)
+        .cte("weeks")
+    )
+    previous_paid = func.lag(weeks.c.paid).over(order_by=weeks.c.week)
+    previous_owned = func.lag(weeks.c.owned).over(order_by=weeks.c.week)
+    expected = case((previous_owned == 1, 10), else_=previous_paid + 10).label("expected")
+    return list(db.session.execute(select(weeks.c.week, weeks.c.paid, weeks.c.owned, expected).order_by(weeks.c.week)))
+
+
+def check_season(season_start_year: int | None = None) -> RebuildReport:
+    """Compares the season's owner balances, and the pot if it's the current season, with the ledger.
+
+    Nothing is changed. Should be run with the settlement lock held, so that no week is settled meanwhile.
+
+    Args:
+        season_start_year (int | None): The year in which the season started. Defaults to the current season.
+
+    Returns:
+        RebuildReport: What differs from the ledger.
+    """
+    if season_start_year is None:
+        season_start_year = get_current_season_start_year()
+    db.session.flush()  # make sure the ledger includes any pending winning games
+    report = RebuildReport(season_start_year=season_start_year, balances=get_balance_changes(season_start_year))
+
+    sequence = get_rollover_sequence(season_start_year)
+    report.rollover_breaks = [
+        RolloverBreak(week=week.week, paid=week.paid, expected=week.expected)
+        for week in sequence
+        if week.expected is not None and week.paid != week.expected
+    ]
+    # there's a single pot, carried over from season to season, so only the current season's ledger sets it
+    if sequence and season_start_year == get_current_season_start_year():
+        last_week = sequence[-1]
+        pot = 10 if last_week.owned else last_week.paid + 10
+        before: int | None = db.session.scalar(select(Pot.amount))
+        if before is not None and before != pot:
+            report.pot = (before, pot)
+    return report
+
+
+def rebuild_season(season_start_year: int | None = None) -> RebuildReport:
+    """Rebuilds the season's owner balances, and the pot if it's the current season, from the ledger.
+
+    Doesn't commit, the caller does (or rolls back, for a dry run). Should be run with the settlement lock held, so
+    that no week is settled meanwhile.
+
+    Args:
+        season_start_year (int | None): The year in which the season started. Defaults to the current season.
+
+    Returns:
+        RebuildReport: What changed.
+    """
+    report = check_season(season_start_year)
+    if report.balances:
+        ledger_total = get_ledger_total()
+        db.session.execute(
+            update(Owner)
+            .where(Owner.season_start_year == report.season_start_year, Owner.winnings != ledger_total)
+            .values(winnings=ledger_total)
+        )
+    if report.pot is not None:
+        db.session.execute(update(Pot).values(amount=report.pot[1]))
+    if report.changed:
+        # the statements above bypass the ORM, so the cached pages must be told about them
+        mark_season_changed(db.session, report.season_start_year)
+    return report
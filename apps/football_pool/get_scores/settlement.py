@@ -0,0 +1,110 @@
+"""Settles each week's results once its games are over, rather than at a fixed time.
+
+The scheduler worker checks the scoreboard every `SETTLEMENT_CHECK`. Once every game of the week is final, and has
+been for `SETTLEMENT_GRACE` (so that last-minute stat corrections land first), the week's winners are written with
+`write_to_db`. A week with a game that isn't final (e.g. one moved to Tuesday) waits for it. Canceled games are
+left out, and so is a game ESPN still has as postponed `SETTLEMENT_POSTPONED_GRACE` after it was due to kick off,
+since it's to be played on a date that isn't set (if at all). Settling a week without them logs a warning.
+
+The Tuesday 1AM job is kept as a backstop, settling a finished week that the checks missed (e.g. while the worker
+was down), but never one that's still being played. Settled weeks are recorded in `settled_weeks` under a lock (see
+`write_to_db`), so a week is never settled twice, whichever process tries.
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask, current_app
+
+from ..years import get_current_season_start_year
+from .exceptions import ESPNUnavailableError
+from .make_games import EST, CurrentWeek, Game, GameStatus, SeasonType
+from .query import get_live_scores
+from .write_to_db import is_week_settled, write_to_db
+
+WeekKey = tuple[int, SeasonType, int]
+"""Identifies a week: (season start year, season type, week number)."""
+
+_FINAL_SINCE: dict[WeekKey, float] = {}
+"""When this worker first saw every game of each week final."""
+
+
+def is_game_over(game: Game) -> bool:
+    """Whether the game is final, canceled, or postponed for longer than `SETTLEMENT_POSTPONED_GRACE`.
+
+    Args:
+        game (Game): The game to check.
+
+    Returns:
+        bool: Whether the week can be settled without waiting on the game.
+    """
+    if game.status == GameStatus.POSTPONED:
+        return datetime.now(tz=EST) - game.gametime >= current_app.config["SETTLEMENT_POSTPONED_GRACE"]
+    return game.is_final or game.status == GameStatus.CANCELED
+
+
+def is_week_over(current_week: CurrentWeek) -> bool:
+    """Whether every game of the week is over, or was called off long enough ago to settle the week without it.
+
+    Args:
+        current_week (CurrentWeek): The week to check.
+
+    Returns:
+        bool: Whether the week is over.
+    """
+    return bool(current_week.games) and all(is_game_over(game) for game in current_week.games)
+
+
+def warn_about_called_off_games(current_week: CurrentWeek) -> None:
+    """Logs a warning about the week's called off games, which it's settled without.
+
+    Args:
+        current_week (CurrentWeek): The week being settled.
+    """
+    called_off = [
+        f"{game.away_team.abbreviation}@{game.home_team.abbreviation} ({game.status})"
+        for game in current_week.games
+        if game.is_called_off
+    ]
+    if called_off:
+        current_app.logger.warning(
+            "Settling %s week %s without its called off games: %s.",
+            current_week.season_type.name_str,
+            current_week.week,
+            ", ".join(called_off),
+        )
+
+
+def settle_week_if_over(app: Flask, grace: timedelta) -> bool:
+    """Settles the current week if every game has been final for the grace period, and it isn't settled yet.
+
+    Args:
+        app (Flask): The app to settle the week for.
+        grace (timedelta): How long every game must have been final for.
+
+    Returns:
+        bool: Whether the week was settled.
+    """
+    with app.app_context():
+        try:
+            current_week = get_live_scores(allow_stale=False)
+        except ESPNUnavailableError as error:
+            current_app.logger.warning("%s Checking whether the week is over later.", error)
+            return False
+        season_start_year = get_current_season_start_year()
+        week_key = (season_start_year, current_week.season_type, current_week.week)
+        if not is_week_over(current_week):
+            _FINAL_SINCE.pop(week_key, None)  # e.g. a game was un-finalized for a review
+            return False
+        now = time.time()
+        final_for = now - _FINAL_SINCE.setdefault(week_key, now)
+        if final_for < grace.total_seconds() or is_week_settled(*week_key):
+            return False
+
+        current_app.logger.info("Every game of week %s is over, settling it.", current_week.week)
+        warn_about_called_off_games(current_week)
+        # the week is claimed under the settlement lock, so it's only settled once whoever else is trying to. It's the
+        # week checked above that's settled, even if the live scores have since rolled over to the next one
+        return write_to_db(app, current_week)
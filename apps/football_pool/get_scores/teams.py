@@ -0,0 +1,101 @@
+"""An in-process identity map of the NFL teams, so that building a scoreboard doesn't query the database.
+
+The teams are loaded once per worker, in their own session, so they're detached: their columns can be read freely
+but relationships (like `Team.owner`) can't be lazy-loaded from them. Query those by `Team.id` instead.
+
+Whenever a transaction changes a team, a version file in the `CACHE_DIR` is touched, and every worker on the host
+reloads its map the next time it's used. `invalidate_team_map` does the same by hand.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, object_session
+
+from ..models import Team, db
+from ..timing import timed
+
+_lock = threading.Lock()
+_teams_by_abbr: Mapping[str, Team] = MappingProxyType({})
+_loaded_version: int | None = None
+
+
+def _version_path() -> Path:
+    return current_app.config["CACHE_DIR"] / "teams.version"
+
+
+def _current_version() -> int:
+    try:
+        return _version_path().stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def invalidate_team_map() -> None:
+    """Makes every worker on the host reload its team map the next time it's used."""
+    version_path = _version_path()
+    version_path.parent.mkdir(parents=True, exist_ok=True)
+    version_path.touch()
+    current_app.logger.info("Invalidated the team map.")
+
+
+def get_teams_by_abbr() -> Mapping[str, Team]:
+    """Gets the (read-only) map of team abbreviations to Teams, loading it if needed.
+
+    Returns:
+        Mapping[str, Team]: The map of team abbreviations to detached Team objects.
+    """
+    global _teams_by_abbr, _loaded_version
+    version = _current_version()
+    if version == _loaded_version:
+        return _teams_by_abbr
+    with _lock:
+        if version != _loaded_version:
+            with Session(db.engine) as session:
+                teams = session.scalars(select(Team)).all()
+            _teams_by_abbr = MappingProxyType({team.abbreviation: team for team in teams})
+            _loaded_version = version
+            current_app.logger.debug("Loaded %s teams into the team map.", len(teams))
+    return _teams_by_abbr
+
+
+def get_team(abbr: str) -> Team:
+    """Gets the team with the given abbreviation from the team map.
+
+    Args:
+        abbr (str): The abbreviation of the desired team.
+
+    Raises:
+        KeyError: If there's no team with the abbreviation.
+
+    Returns:
+        Team: The (detached) Team with the corresponding abbreviation.
+    """
+    try:
+        with timed("teams"):
+            return get_teams_by_abbr()[abbr]
+    except KeyError:
+        current_app.logger.warning("No team '%s' in the team map, reloading it.", abbr)
+        invalidate_team_map()
+        return get_teams_by_abbr()[abbr]
+
+
+@event.listens_for(Team, "after_insert")
+@event.listens_for(Team, "after_update")
+@event.listens_for(Team, "after_delete")
+def _flag_teams_changed(mapper, connection, target: Team) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info["teams_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_if_teams_changed(session: Session) -> None:
+    if session.info.pop("teams_changed", False):
+        invalidate_team_map()
@@ -0,0 +1,183 @@
+"""An incremental tracker of the teams currently winning the pool while games are being played.
+
+The tracker is fed successive CurrentWeek snapshots. It only looks at the games whose score or status changed
+since the previous snapshot, updating per-score buckets of teams from which the MOST, LEAST and FIFTY leaders
+are read, and reports what changed so that consumers don't have to diff whole weeks themselves.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+from ..models import Team, WinningType
+from .make_games import CALLED_OFF_STATUSES, CurrentWeek, Game, GameStatus, SeasonType
+from .winners import FIFTY_POINTS
+
+TRACKED_WINNING_TYPES = (WinningType.MOST, WinningType.LEAST, WinningType.FIFTY)
+
+
+@dataclass(frozen=True)
+class LeaderChange:
+    """An event for when the teams leading the pool for a WinningType changed."""
+
+    winning_type: WinningType
+    leaders: frozenset[Team]
+    added: frozenset[Team]
+    removed: frozenset[Team]
+
+
+@dataclass(frozen=True)
+class TrackerUpdate:
+    """Everything that changed between two snapshots of the week."""
+
+    changed_games: tuple[Game, ...]
+    leader_changes: tuple[LeaderChange, ...]
+
+    def __bool__(self) -> bool:
+        return bool(self.changed_games or self.leader_changes)
+
+
+def game_key(game: Game) -> tuple[str, str]:
+    """Identifies a game within a week by its teams.
+
+    Args:
+        game (Game): The game to identify.
+
+    Returns:
+        tuple[str, str]: The abbreviations of the away and home teams.
+    """
+    return (game.away_team.abbreviation, game.home_team.abbreviation)
+
+
+class _ScoreBuckets:
+    """Teams bucketed by score, with the highest and lowest scores cached until their bucket empties."""
+
+    def __init__(self) -> None:
+        self.teams_by_score: defaultdict[int, set[Team]] = defaultdict(set)
+        self._max: int | None = None
+        self._min: int | None = None
+        self._stale = False
+
+    def add(self, team: Team, score: int) -> None:
+        self.teams_by_score[score].add(team)
+        if not self._stale:
+            self._max = score if self._max is None else max(self._max, score)
+            self._min = score if self._min is None else min(self._min, score)
+
+    def remove(self, team: Team, score: int) -> None:
+        bucket = self.teams_by_score[score]
+        bucket.discard(team)
+        if not bucket:
+            del self.teams_by_score[score]
+            if score in (self._max, self._min):
+                self._stale = True
+
+    def extremes(self) -> tuple[int | None, int | None]:
+        if self._stale:
+            self._max = max(self.teams_by_score, default=None)
+            self._min = min(self.teams_by_score, default=None)
+            self._stale = False
+        return self._max, self._min
+
+    def get(self, score: int) -> set[Team]:
+        return self.teams_by_score.get(score, set())
+
+
+class LiveWinnerTracker:
+    """Tracks the MOST, LEAST and FIFTY leaders across successive snapshots of a week."""
+
+    def __init__(self) -> None:
+        self._week: tuple[SeasonType, int] | None = None
+        self._is_regular_season = False
+        self._games: dict[tuple[str, str], tuple[int, int, GameStatus]] = {}
+        self._started = _ScoreBuckets()
+        self._queued = _ScoreBuckets()
+        self._leaders: dict[WinningType, frozenset[Team]] = {
+            winning_type: frozenset() for winning_type in TRACKED_WINNING_TYPES
+        }
+
+    @property
+    def leaders(self) -> dict[WinningType, frozenset[Team]]:
+        """The teams currently leading the pool, for the MOST, LEAST and FIFTY WinningTypes."""
+        return dict(self._leaders)
+
+    def _buckets_for(self, status: GameStatus) -> _ScoreBuckets:
+        return self._queued if status == GameStatus.QUEUED else self._started
+
+    def _apply(self, game: Game, previous: tuple[int, int, GameStatus] | None) -> None:
+        # a called off game's teams are in no bucket, like the winner engine leaves them out
+        if previous is not None and previous[2] not in CALLED_OFF_STATUSES:
+            home_score, away_score, status = previous
+            buckets = self._buckets_for(status)
+            buckets.remove(game.home_team, home_score)
+            buckets.remove(game.away_team, away_score)
+        if game.is_called_off:
+            return
+        buckets = self._buckets_for(game.status)
+        buckets.add(game.home_team, game.home_team_score)
+        buckets.add(game.away_team, game.away_team_score)
+
+    def _compute_leaders(self) -> dict[WinningType, frozenset[Team]]:
+        leaders = {
+            WinningType.FIFTY: frozenset(self._started.get(FIFTY_POINTS) | self._queued.get(FIFTY_POINTS)),
+            WinningType.MOST: frozenset(),
+            WinningType.LEAST: frozenset(),
+        }
+        if self._is_regular_season:
+            # like the winner engine: without a started game, the most and least points are both zero
+            most_points, least_points = self._started.extremes()
+            most_points = 0 if most_points is None else most_points
+            least_points = 0 if least_points is None else least_points
+            leaders[WinningType.MOST] = frozenset(self._started.get(most_points) | self._queued.get(most_points))
+            leaders[WinningType.LEAST] = frozenset(self._started.get(least_points) | self._queued.get(least_points))
+        return leaders
+
+    def _reset(self, current_week: CurrentWeek) -> None:
+        self._week = (current_week.season_type, current_week.week)
+        self._is_regular_season = current_week.season_type == SeasonType.REGULAR_SEASON
+        self._games = {}
+        self._started = _ScoreBuckets()
+        self._queued = _ScoreBuckets()
+
+    def update(self, current_week: CurrentWeek) -> TrackerUpdate:
+        """Updates the leaders from a new snapshot of the week, using only the games that changed.
+
+        A snapshot of a different week starts the tracking over.
+
+        Args:
+            current_week (CurrentWeek): The latest snapshot of the week.
+
+        Returns:
+            TrackerUpdate: The games that changed, and the resulting changes to the leaders.
+        """
+        if (current_week.season_type, current_week.week) != self._week:
+            self._reset(current_week)
+
+        changed_games: list[Game] = []
+        for game in current_week.games:
+            key = game_key(game)
+            state = (game.home_team_score, game.away_team_score, game.status)
+            previous = self._games.get(key)
+            if state == previous:
+                continue
+            self._apply(game, previous)
+            self._games[key] = state
+            changed_games.append(game)
+
+        leader_changes: list[LeaderChange] = []
+        if changed_games:
+            leaders = self._compute_leaders()
+            for winning_type in TRACKED_WINNING_TYPES:
+                old_leaders, new_leaders = self._leaders[winning_type], leaders[winning_type]
+                if old_leaders != new_leaders:
+                    leader_changes.append(
+                        LeaderChange(
+                            winning_type=winning_type,
+                            leaders=new_leaders,
+                            added=new_leaders - old_leaders,
+                            removed=old_leaders - new_leaders,
+                        )
+                    )
+            self._leaders = leaders
+        return TrackerUpdate(changed_games=tuple(changed_games), leader_changes=tuple(leader_changes))
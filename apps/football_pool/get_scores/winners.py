@@ -0,0 +1,160 @@
+"""A single-pass engine computing every kind of pool winner for a week.
+
+The week's games are reduced once, into the highest and lowest scores (and the teams that scored them),
+the fifty point scorers and the winners of completed games, from which every WinningType's winners follow.
+Both the scoreboard and the settlement of each week take their winners from here.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from flask import current_app
+
+from ..models import Team, WinningType
+from .make_games import CurrentWeek, SeasonType
+
+FIFTY_POINTS = 50
+
+
+@dataclass(frozen=True)
+class WeekWinners:
+    """The teams winning the pool for a week, for every WinningType."""
+
+    winning_type: WinningType
+    most: tuple[Team, ...]
+    least: tuple[Team, ...]
+    fifty: tuple[Team, ...]
+    playoff: tuple[Team, ...]
+    super_bowl: tuple[Team, ...]
+
+    @property
+    def weekly(self) -> tuple[Team, ...]:
+        """The most or least winners, if it's a regular season week.
+
+        Returns:
+            tuple[Team, ...]: The week's most or least winners.
+        """
+        if self.winning_type == WinningType.MOST:
+            return self.most
+        if self.winning_type == WinningType.LEAST:
+            return self.least
+        return ()
+
+    @property
+    def pool_winning_teams(self) -> set[Team]:
+        """All teams that are currently winning the football pool.
+
+        Returns:
+            set[Team]: A set of Teams that are currently winning the football pool.
+        """
+        return set(self.weekly + self.fifty + self.playoff + self.super_bowl)
+
+    @property
+    def by_winning_type(self) -> list[tuple[WinningType, tuple[Team, ...]]]:
+        """The winning teams of each WinningType that has any, as they'd be paid out.
+
+        On Super Bowl week, the game's winner is only listed as the Super Bowl winner.
+
+        Returns:
+            list[tuple[WinningType, tuple[Team, ...]]]: The WinningTypes with winners, and their winning teams.
+        """
+        winners_by_type = [
+            (self.winning_type, self.weekly),
+            (WinningType.FIFTY, self.fifty),
+            (WinningType.SUPER_BOWL, self.super_bowl),
+            (WinningType.PLAYOFF, () if self.super_bowl else self.playoff),
+        ]
+        return [(winning_type, teams) for winning_type, teams in winners_by_type if teams]
+
+
+class _ExtremeScores:
+    """Accumulates the highest and lowest scores, and the teams that scored them."""
+
+    def __init__(self) -> None:
+        self.most_points: int | None = None
+        self.least_points: int | None = None
+        self.most: list[Team] = []
+        self.least: list[Team] = []
+
+    def add(self, team: Team, score: int) -> None:
+        if self.most_points is None or score > self.most_points:
+            self.most_points, self.most = score, [team]
+        elif score == self.most_points:
+            self.most.append(team)
+        if self.least_points is None or score < self.least_points:
+            self.least_points, self.least = score, [team]
+        elif score == self.least_points:
+            self.least.append(team)
+
+    def add_queued(self, queued: list[tuple[Team, int]]) -> None:
+        # without a started game, nobody has scored: the most and least points are both zero
+        self.most_points = 0 if self.most_points is None else self.most_points
+        self.least_points = 0 if self.least_points is None else self.least_points
+        self.most.extend(team for team, score in queued if score == self.most_points)
+        self.least.extend(team for team, score in queued if score == self.least_points)
+
+
+def compute_week_winners(current_week: CurrentWeek) -> WeekWinners:
+    """Computes the week's winners for every WinningType in a single pass over its games.
+
+    These are the winners both shown live and paid when the week is settled. The most/least scores only consider
+    games that have started, but any team (even in a queued game) with that score is a winner.
+    Games count as completed once their clock reads "0:00", and tied games have no winner. Called off games don't count.
+
+    Args:
+        current_week (CurrentWeek): The CurrentWeek containing scores of Game objects.
+
+    Returns:
+        WeekWinners: The week's winners.
+    """
+    is_regular_season = current_week.season_type == SeasonType.REGULAR_SEASON
+    is_postseason = current_week.season_type == SeasonType.POSTSEASON
+    is_super_bowl = is_postseason and current_week.week == 5
+
+    extremes = _ExtremeScores()
+    queued: list[tuple[Team, int]] = []
+    fifty: list[Team] = []
+    completed_winners: list[Team] = []
+    for game in current_week.games:
+        if game.is_called_off:
+            continue
+        home_team, home_score = game.home_team, game.home_team_score
+        away_team, away_score = game.away_team, game.away_team_score
+        if home_score == FIFTY_POINTS:
+            fifty.append(home_team)
+        if away_score == FIFTY_POINTS:
+            fifty.append(away_team)
+
+        if game.is_queued:
+            queued.append((home_team, home_score))
+            queued.append((away_team, away_score))
+        elif is_regular_season:
+            extremes.add(home_team, home_score)
+            extremes.add(away_team, away_score)
+
+        if is_postseason and game.display_clock == "0:00" and home_score != away_score:
+            completed_winners.append(home_team if home_score > away_score else away_team)
+
+    if is_regular_season:
+        extremes.add_queued(queued)
+
+    winners = WeekWinners(
+        winning_type=current_week.winning_type,
+        most=tuple(extremes.most),
+        least=tuple(extremes.least),
+        fifty=tuple(fifty),
+        playoff=tuple(completed_winners) if is_postseason else (),
+        super_bowl=tuple(completed_winners) if is_super_bowl else (),
+    )
+    current_app.logger.debug(
+        "Winners: most=%s (%s), least=%s (%s), fifty=%s, playoff=%s, super bowl=%s.",
+        extremes.most_points,
+        len(winners.most),
+        extremes.least_points,
+        len(winners.least),
+        len(winners.fifty),
+        len(winners.playoff),
+        len(winners.super_bowl),
+    )
+    return winners
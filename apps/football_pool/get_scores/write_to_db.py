@@ -1,93 +1,282 @@
-from flask import Flask
+from collections import defaultdict
 
-from ..models import Pot, Team, WinningGame, WinningType, db
+from flask import Flask, current_app
+from sqlalchemy import Integer, column, exists, func, select, update, values
+from sqlalchemy.dialects import postgresql, sqlite
+
+from ..metrics import observe_job
+from ..models import Owner, Pot, SettledWeek, Team, WinningGame, WinningType, db
+from ..page_cache import mark_season_changed
 from ..years import get_current_season_start_year
+from .leaderboard import refresh_season_leaderboard
+from .make_games import CurrentWeek, SeasonType
 from .query import get_live_scores
+from .rebuild import check_season
+
+SETTLEMENT_LOCK_ID = 0x666F6F7462616C6C
+"""The key of the settlement's Postgres advisory lock ("football" in ASCII)."""
+
+
+def get_owners_by_team_id(season_start_year: int) -> dict[int, Owner]:
+    """Gets the owners of the season, keyed by the ID of the team they own.
+
+    The Teams in a CurrentWeek come from the team map, and can't lazy-load their owners, so they're looked up here.
+
+    Args:
+        season_start_year (int): The year in which the season started.
+
+    Returns:
+        dict[int, Owner]: The season's owners, keyed by their team's ID.
+    """
+    owners: list[Owner] = Owner.query.where(Owner.season_start_year == season_start_year).all()
+    return {owner.team_id: owner for owner in owners}
+
+
+def week_has_real_winners(winners: list[Team], owners_by_team_id: dict[int, Owner]) -> bool:
+    return any(winner.id in owners_by_team_id for winner in winners)
+
+
+def acquire_settlement_lock() -> None:
+    """Waits for the settlement lock, held until the current transaction ends, so that only one process settles.
+
+    It's a Postgres advisory lock, so it guards every container running against the database. Other databases
+    (e.g. SQLite in tests) only have the `settled_weeks` unique constraint.
+    """
+    if db.session.get_bind().dialect.name == "postgresql":
+        db.session.execute(select(func.pg_advisory_xact_lock(SETTLEMENT_LOCK_ID)))
+
+
+def is_week_settled(season_start_year: int, season_type: SeasonType, week: int) -> bool:
+    """Whether a week's results have already been written.
+
+    Args:
+        season_start_year (int): The year in which the week's season started.
+        season_type (SeasonType): The week's season type.
+        week (int): The week's number.
+
+    Returns:
+        bool: Whether the week is settled.
+    """
+    settled = exists().where(
+        SettledWeek.season_start_year == season_start_year,
+        SettledWeek.season_type == season_type,
+        SettledWeek.week == week,
+    )
+    return bool(db.session.scalar(select(settled)))
+
+
+def claim_week(season_start_year: int, current_week: CurrentWeek) -> bool:
+    """Marks the week as settled in the current transaction, unless it already is.
+
+    Must be called with the settlement lock held, so that no other process can claim it meanwhile.
+
+    Args:
+        season_start_year (int): The year in which the week's season started.
+        current_week (CurrentWeek): The week to claim.
+
+    Returns:
+        bool: Whether the week was claimed, i.e. it's up to the caller to settle it.
+    """
+    if is_week_settled(season_start_year, current_week.season_type, current_week.week):
+        return False
+    db.session.add(
+        SettledWeek(
+            season_start_year=season_start_year,
+            season_type=current_week.season_type,
+            week=current_week.week,
+        )
+    )
+    return True
+
+
+def get_week_prizes(current_week: CurrentWeek, pot: int) -> tuple[list[Team], int, WinningType]:
+    """Gets the week's winners and what they win, without the 50-point winners.
+
+    Args:
+        current_week (CurrentWeek): The week that's over.
+        pot (int): The pot going into the week, won by the regular season's weekly winners.
 
-NUM_WEEKS_IN_REG_SEASON = 18
+    Returns:
+        tuple[list[Team], int, WinningType]: The winning teams, how much each won, and how they won it.
+    """
+    winners = current_week.get_winners()
+    # if it's Super Bowl week, the winner gets $25
+    if current_week.is_super_bowl:
+        return list(winners.super_bowl), 25, WinningType.SUPER_BOWL
+    # if it's a postseason week, all winners get $10
+    if current_week.is_postseason:
+        return list(winners.playoff), 10, WinningType.PLAYOFF
+    # otherwise, the teams scoring most/least (appropriately) get the pot
+    return list(winners.weekly), pot, current_week.winning_type
+
+
+def get_week_winners(
+    current_week: CurrentWeek, owners_by_team_id: dict[int, Owner]
+) -> tuple[list[Team], int, WinningType]:
+    """Gets the week's winners and what they win, updating the pot for regular season weeks.
+
+    Args:
+        current_week (CurrentWeek): The week that's over.
+        owners_by_team_id (dict[int, Owner]): The season's owners, keyed by their team's ID.
+
+    Returns:
+        tuple[list[Team], int, WinningType]: The winning teams, how much each won, and how they won it.
+    """
+    pot: int = db.session.scalar(select(Pot.amount))  # type: ignore[assignment]
+    winners, winnings, winning_type = get_week_prizes(current_week, pot)
+    if current_week.is_postseason:
+        return winners, winnings, winning_type
+    # increase the pot amount, if needed
+    if week_has_real_winners(winners, owners_by_team_id):
+        # this week has winners, set the pot to 10
+        db.session.execute(update(Pot).values(amount=10))
+    elif not current_week.is_preseason:
+        # no winners here, increase the pot by 10
+        db.session.execute(update(Pot).values(amount=Pot.amount + 10))
+    return winners, winnings, winning_type
 
 
-def week_has_real_winners(winners: list[Team]) -> bool:
-    return any(winner.owner is not None for winner in winners)
+def get_winning_game_rows(
+    current_week: CurrentWeek,
+    season_start_year: int,
+    prizes: tuple[list[Team], int, WinningType],
+) -> list[dict]:
+    """Gets the columns of the week's winning games: its winners' prizes, and $50 for each 50-point scorer.
 
+    Args:
+        current_week (CurrentWeek): The week that's over.
+        season_start_year (int): The year in which the week's season started.
+        prizes (tuple[list[Team], int, WinningType]): The week's winners, how much each won, and how they won it.
 
-def write_to_db(current_app: Flask) -> None:
-    """Computes the winners for the week and writes them to the database, returning them.
+    Returns:
+        list[dict]: The columns of each winning game.
+    """
+    winners, winnings, winning_type = prizes
+    current_app.logger.info("Winners: %s", [team.abbreviation for team in winners])
+    current_app.logger.info("Winnings: %s", winnings)
+    current_app.logger.info("Winning Type: %s", winning_type.name_str)
+    # regardless, a 50-point scorer wins $50!
+    fifty_point_teams = current_week.get_winners().fifty
+    current_app.logger.info("50 point winners: %s", [team.abbreviation for team in fifty_point_teams])
+    return [
+        {
+            "season_start_year": season_start_year,
+            "season_type": current_week.season_type,
+            "week": current_week.week,
+            "team_id": team.id,
+            "winning_type": team_winning_type,
+            "winnings": team_winnings,
+        }
+        for teams, team_winnings, team_winning_type in (
+            (winners, winnings, winning_type),
+            (fifty_point_teams, 50, WinningType.FIFTY),
+        )
+        for team in teams
+    ]
+
+
+def insert_winning_games(rows: list[dict]) -> list[tuple[int, int]]:
+    """Inserts winning games, skipping any already written for the same (season, season type, week, team, type).
+
+    Args:
+        rows (list[dict]): The winning games' columns.
 
     Returns:
-        list[WinningGame]: The list of WinningGame objects.
+        list[tuple[int, int]]: The team ID and winnings of each winning game that was actually inserted.
     """
-    with current_app.app_context():
+    if not rows:
+        return []
+    # an `INSERT` that supports `ON CONFLICT`, for Postgres (in prod) or SQLite (in tests)
+    insert = postgresql.insert if db.session.get_bind().dialect.name == "postgresql" else sqlite.insert
+    statement = (
+        insert(WinningGame)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["season_start_year", "season_type", "week", "team_id", "winning_type"])
+        .returning(WinningGame.team_id, WinningGame.winnings)
+    )
+    return [(team_id, winnings) for team_id, winnings in db.session.execute(statement)]
+
+
+def pay_owners(season_start_year: int, payouts: list[tuple[int, int]]) -> None:
+    """Adds winnings to the balances of the teams' owners, in one `UPDATE ... FROM` a `VALUES` list.
+
+    Args:
+        season_start_year (int): The year in which the season started.
+        payouts (list[tuple[int, int]]): The team ID and winnings of each payout, a team can be paid more than once.
+    """
+    totals: defaultdict[int, int] = defaultdict(int)
+    for team_id, winnings in payouts:
+        totals[team_id] += winnings
+    if not totals:
+        return
+    # as a CTE, which (unlike an aliased `VALUES` in the `FROM`) both Postgres and SQLite support
+    paid = (
+        values(column("team_id", Integer), column("winnings", Integer), name="payouts").data(list(totals.items())).cte()
+    )
+    db.session.execute(
+        update(Owner)
+        .where(Owner.season_start_year == season_start_year, Owner.team_id == paid.c.team_id)
+        .values(winnings=Owner.winnings + paid.c.winnings)
+    )
+
+
+def settle_week(current_week: CurrentWeek, season_start_year: int) -> None:
+    """Writes the week's winning games, pays their owners and updates the pot. Doesn't commit, the caller does.
+
+    Winning games that were already written are skipped, along with their payouts, so it's safe to re-run.
+
+    Args:
+        current_week (CurrentWeek): The week that's over.
+        season_start_year (int): The year in which the week's season started.
+    """
+    owners_by_team_id = get_owners_by_team_id(season_start_year)
+    prizes = get_week_winners(current_week, owners_by_team_id)
+    rows = get_winning_game_rows(current_week, season_start_year, prizes)
+    pay_owners(season_start_year, insert_winning_games(rows))
+    # the statements above bypass the ORM, so the cached pages must be told about them
+    mark_season_changed(db.session, season_start_year)
+    # bring the leaderboard up to date, in the same transaction
+    refresh_season_leaderboard(season_start_year)
+
+
+def write_to_db(current_app: Flask, current_week: CurrentWeek | None = None) -> bool:
+    """Computes the winners for the week and writes them to the database, unless the week is already settled.
+
+    The week is claimed under the settlement lock and in the same transaction as its results, so however many
+    processes try to settle it, owners are only paid (and the pot only bumped) once, and a re-run is a no-op.
+
+    Args:
+        current_week (CurrentWeek | None, optional): The week to settle, which the caller checked is over.
+            Defaults to the live week, fetched from ESPN.
+
+    Returns:
+        bool: Whether the week was settled by this call.
+    """
+    with current_app.app_context(), observe_job("write_to_db"):
         current_app.logger.info("Beginning the writing of the week's results to the database.")
-        current_week = get_live_scores()
-        if current_week.is_pro_bowl:  # nobody wins anything on pro bowl week
-            return  # if it's the pro bowl, just exit early
-        # if it's Super Bowl week, the winner gets $25
-        if current_week.is_super_bowl:
-            winners = current_week.get_super_bowl_winners()
-            winnings = 25
-            winning_type = WinningType.SUPER_BOWL
-        # if it's a postseason week, all winners get $10
-        elif current_week.is_postseason:
-            winners = current_week.get_postseason_winners()
-            winnings = 10
-            winning_type = WinningType.PLAYOFF
-        # otherwise, the teams scoring most/least (appropriately) get $10
-        else:
-            pot: Pot = Pot.query.one()
-            winners = current_week.get_weekly_winning_teams()
-            winnings = pot.amount
-            winning_type = current_week.winning_type
-            # increase the pot amount, if needed
-            if week_has_real_winners(winners):
-                # this week has winners, set the pot to 10
-                pot.amount = 10
-            elif not current_week.is_preseason:
-                # no winners here, increase the pot by 10
-                pot.amount += 10
-        current_app.logger.info("Winners: %s", [team.abbreviation for team in winners])
-        current_app.logger.info("Winnings: %s", winnings)
-        current_app.logger.info("Winning Type: %s", winning_type.name_str)
-        # regardless, a 50-point scorer wins $50!
-        fifty_point_teams = current_week.get_fifty_point_winners()
-        current_app.logger.info("50 point winners: %s", [team.abbreviation for team in fifty_point_teams])
-
-        # now lets start making the WinningGame objects
-        current_week_num = current_week.week
-        if current_week.is_postseason:
-            current_week_num += NUM_WEEKS_IN_REG_SEASON
-
-        winning_games: list[WinningGame] = []
+        if current_week is None:
+            # the results are final, so they must come from ESPN's latest scores rather than a stale snapshot
+            current_week = get_live_scores(allow_stale=False)
         season_start_year = get_current_season_start_year()
-        for team in winners:
-            winning_games.append(
-                WinningGame(
-                    week=current_week.week,
-                    winnings=winnings,
-                    winning_type=winning_type,
-                    team=team,
-                    season_start_year=season_start_year,
-                )
-            )
-            if team.owner is not None:
-                team.owner.winnings += winnings
-        for team in fifty_point_teams:
-            winning_games.append(
-                WinningGame(
-                    week=current_week.week,
-                    winnings=50,
-                    winning_type=WinningType.FIFTY,
-                    team=team,
-                    season_start_year=season_start_year,
-                )
+        acquire_settlement_lock()
+        if not claim_week(season_start_year, current_week):
+            current_app.logger.info("Week %s is already settled. Exiting.", current_week.week)
+            db.session.rollback()
+            return False
+        # nobody wins anything on pro bowl week, but it's settled all the same
+        if not current_week.is_pro_bowl:
+            settle_week(current_week, season_start_year)
+        # as a consistency check, the running totals are compared with the ledger. They're left as they are, as they
+        # may have been corrected by hand: `flask pool rebuild` sets them from the ledger
+        report = check_season(season_start_year)
+        if report.changed:
+            current_app.logger.warning(
+                "The totals don't match the ledger, run `flask pool rebuild` to set them from it: %s",
+                "; ".join(report.lines()),
             )
-            if team.owner is not None:
-                team.owner.winnings += 50
-
-        # add all of 'em and push em up!
-        db.session.add_all(winning_games)
         db.session.commit()
         current_app.logger.info("Information written to the database. Exiting.")
+        return True
 
 
 if __name__ == "__main__":
@@ -1,19 +1,39 @@
-"""A gunicorn config file, used to define tasks done at certain hooks.
+"""A gunicorn config file, used to define the server's settings and tasks done at certain hooks.
 
-- `on_starting`: Sets the job scheduler to run on the app.
-                 Runs on startup so that only one worker (the main arbiter) runs the scheduled task.
+Settings (from environment variables):
+- `GUNICORN_WORKERS`: How many worker processes to run. Defaults to 4.
+- `GUNICORN_WORKER_CLASS`: The type of worker, "sync" or "gevent". Defaults to "sync".
+    Sync workers handle one request at a time, so a handful of requests waiting on ESPN (or the database) can hold
+    every worker. Gevent workers handle each request in a green thread, so waiting requests don't block the rest.
+- `GUNICORN_WORKER_CONNECTIONS`: How many requests each gevent worker handles at once. Defaults to 100.
+- `WEB_PORT`: The port to bind to. Defaults to 5600.
+
+Scheduled jobs aren't run by gunicorn, but by their own process (`flask pool worker`).
+
+Hooks:
+- `child_exit`: Marks an exited worker's metrics as dead, so that its gauges stop being reported.
 """
 
+import os
+
 from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
 
-from football_pool.job_scheduling import schedule_result_computation
+bind = f"0.0.0.0:{os.getenv('WEB_PORT', '5600')}"
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
 
 
-# https://docs.gunicorn.org/en/stable/settings.html#on-starting
-def on_starting(main_worker: Arbiter):
-    """Sets up the job scheduler to schedule the computation of results for the database.
+# https://docs.gunicorn.org/en/stable/settings.html#child-exit
+def child_exit(main_worker: Arbiter, worker: Worker):
+    """Cleans up after a worker's metrics once it exits.
 
     Args:
         main_worker (Arbiter): The central main worker process from gunicorn.
+        worker (Worker): The worker that exited.
     """
-    schedule_result_computation()
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,86 @@
+"""Health checks for the orchestrator: a liveness probe, and a readiness probe that never touches ESPN.
+
+- `/healthcheck` (liveness): The worker is up and serving requests. It's a constant, so it can't fail or hang
+  because of anything the app depends on.
+- `/healthcheck/ready` (readiness): The worker can check a connection out of the database pool and run a query on it.
+  It also reports how fresh the shared scoreboard snapshot is, from its metadata, but a stale scoreboard doesn't make
+  the worker unready since stale scores can still be served.
+
+The database check runs on one background thread per worker and is waited on for at most `HEALTHCHECK_TIMEOUT`.
+If a previous check is still stuck (e.g. waiting for the pool or a hung connection), the worker is reported unready
+straight away instead of starting another one, so probes never pile up on the database or tie up the workers.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from flask import Flask, current_app
+from sqlalchemy import text
+
+from .get_scores.cache import get_scoreboard_cache, scoreboard_key
+from .get_scores.query import DEFAULT_PARAMS, DEFAULT_URL
+from .models import db
+
+
+class DatabaseCheck:
+    """Checks that a connection can be checked out of the database pool, without ever blocking for long."""
+
+    def __init__(self, app: Flask) -> None:
+        self._app = app
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="healthcheck")
+        self._pending: Future[float] | None = None
+
+    def _ping(self) -> float:
+        start_time = time.perf_counter()
+        with self._app.app_context(), db.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return time.perf_counter() - start_time
+
+    def run(self, timeout: float) -> dict:
+        """Pings the database, waiting for at most the timeout.
+
+        Args:
+            timeout (float): How long to wait for the ping, in seconds.
+
+        Returns:
+            dict: Whether the database is reachable, and how long the ping took or why it failed.
+        """
+        if self._pending is None or self._pending.done():
+            self._pending = self._executor.submit(self._ping)
+        else:
+            return {"ok": False, "error": "a previous check is still waiting on the database"}
+        try:
+            latency = self._pending.result(timeout=timeout)
+        except FutureTimeoutError:
+            return {"ok": False, "error": f"timed out after {timeout:g}s"}
+        except Exception as error:
+            current_app.logger.warning("Readiness check failed to reach the database: %s", error)
+            return {"ok": False, "error": type(error).__name__}
+        return {"ok": True, "latency_ms": round(latency * 1000, 1)}
+
+
+def get_database_check() -> DatabaseCheck:
+    """Gets the database check for the current app, creating it on first use.
+
+    Returns:
+        DatabaseCheck: The app's database check.
+    """
+    check = current_app.extensions.get("database_check")
+    if check is None:
+        check = DatabaseCheck(app=current_app._get_current_object())  # type: ignore[attr-defined]
+        current_app.extensions["database_check"] = check
+    return check
+
+
+def check_readiness() -> tuple[bool, dict]:
+    """Checks whether this worker is ready to serve requests.
+
+    Returns:
+        tuple[bool, dict]: Whether the worker is ready, and the result of each check.
+    """
+    database = get_database_check().run(timeout=current_app.config["HEALTHCHECK_TIMEOUT"].total_seconds())
+    scoreboard = get_scoreboard_cache().status(scoreboard_key(DEFAULT_URL, DEFAULT_PARAMS))
+    return database["ok"], {"database": database, "scoreboard": scoreboard}
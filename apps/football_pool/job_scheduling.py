@@ -1,22 +1,113 @@
-"""Contains scheduled jobs run with 'apscheduler'."""
+"""Contains scheduled jobs run with 'apscheduler', by the scheduler worker (`flask pool worker`).
 
+- `settle_finished_week`: Every `SETTLEMENT_CHECK`, settles the week once all of its games are over.
+- `compute_week_results`: On Tuesdays at 1AM EST, a backstop settling a finished week the checks missed.
+
+The worker is its own process, so the web workers can scale or restart without losing (or duplicating) a job.
+Jobs are persisted in the database's `apscheduler_jobs` table: a run that was due while the worker was down
+happens as soon as it's back, and restarting it keeps each job's schedule rather than adding it again.
+Only one scheduler worker should run against a database.
+"""
+
+from __future__ import annotations
+
+import signal
+import threading
+from datetime import timedelta
+from typing import Callable
+
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.base import BaseTrigger
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from flask import Flask, current_app
+
+from .get_scores import EST
+from .get_scores.settlement import settle_week_if_over
+from .models import db
+
+JOBSTORE_TABLE = "apscheduler_jobs"
+COMPUTE_RESULTS_JOB_ID = "compute_week_results"
+SETTLE_WEEK_JOB_ID = "settle_finished_week"
+
+_worker_app: Flask | None = None
+"""The app whose jobs the scheduler runs. Persisted jobs are stored by reference, so they can't carry it."""
+
+
+def settle_finished_week() -> None:
+    """Settles the week once every game has been final for the grace period."""
+    assert _worker_app is not None, "Jobs must be run by the scheduler worker."
+    settle_week_if_over(_worker_app, grace=_worker_app.config["SETTLEMENT_GRACE"])
+
 
-from football_pool import create_app
-from football_pool.get_scores import EST, write_to_db
+def compute_week_results() -> None:
+    """Settles the week if it's over and hasn't been yet, as a backstop to `settle_finished_week`."""
+    assert _worker_app is not None, "Jobs must be run by the scheduler worker."
+    if settle_week_if_over(_worker_app, grace=timedelta(0)):
+        _worker_app.logger.warning("The week was settled by the backstop, rather than once its games were over.")
 
 
-def schedule_result_computation() -> None:
-    """Schedules the computation of results into the database for Tuesday at 1AM EST."""
-    app = create_app()
-    scheduler = BackgroundScheduler()
+def _ensure_job(scheduler: BackgroundScheduler, job_id: str, func: Callable[[], None], trigger: BaseTrigger) -> None:
+    """Adds a job if it isn't persisted yet, keeping the schedule of one that is unless its trigger changed."""
+    job = scheduler.get_job(job_id)
+    if job is None:
+        scheduler.add_job(
+            func=func,
+            id=job_id,
+            trigger=trigger,
+            misfire_grace_time=None,
+            max_instances=1,
+            coalesce=True,
+        )
+    elif str(job.trigger) != str(trigger):
+        scheduler.reschedule_job(job_id, trigger=trigger)
+
+
+def start_scheduler(app: Flask) -> BackgroundScheduler:
+    """Starts the job scheduler, running the jobs persisted in the app's database and adding any that are missing.
+
+    Args:
+        app (Flask): The app to run the jobs for.
+
+    Returns:
+        BackgroundScheduler: The running scheduler.
+    """
+    global _worker_app
+    _worker_app = app
+
+    with app.app_context():
+        jobstore = SQLAlchemyJobStore(engine=db.engine, tablename=JOBSTORE_TABLE)
+    scheduler = BackgroundScheduler(jobstores={"default": jobstore}, timezone=EST)
     scheduler.start()
-    scheduler.add_job(
-        func=write_to_db,
-        args=[app],
-        trigger=CronTrigger(day_of_week="tue", hour=1, minute=0, timezone=EST),
-        misfire_grace_time=None,
-        max_instances=1,
-        coalesce=True,
+
+    _ensure_job(
+        scheduler,
+        SETTLE_WEEK_JOB_ID,
+        settle_finished_week,
+        IntervalTrigger(seconds=app.config["SETTLEMENT_CHECK"].total_seconds(), timezone=EST),
+    )
+    _ensure_job(
+        scheduler,
+        COMPUTE_RESULTS_JOB_ID,
+        compute_week_results,
+        CronTrigger(day_of_week="tue", hour=1, minute=0, timezone=EST),
     )
+    return scheduler
+
+
+def run_scheduler_worker() -> None:
+    """Runs the job scheduler until the process is interrupted or terminated. Must be run within an app context."""
+    app: Flask = current_app._get_current_object()  # type: ignore[attr-defined]
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+
+    scheduler = start_scheduler(app)
+    for job in scheduler.get_jobs():
+        app.logger.info("Scheduled job '%s', next running at %s.", job.id, job.next_run_time)
+    try:
+        stopping.wait()
+    except KeyboardInterrupt:
+        pass
+    app.logger.info("Stopping the job scheduler, once any running job finishes.")
+    scheduler.shutdown(wait=True)
@@ -0,0 +1,171 @@
+"""Prometheus metrics, served from `/metrics` and aggregated across every gunicorn worker.
+
+When the `PROMETHEUS_MULTIPROC_DIR` environment variable is set (as it is in prod), every process writes its metrics
+to its own files in that directory, and `/metrics` sums them up, so counters don't reset or jump around depending on
+which worker answers the scrape. The container's entrypoint empties the directory on startup, and `gunicorn_config.py`
+cleans up after workers that exit. Without it (e.g. in development), each process only serves its own metrics.
+
+Settling weeks and querying ESPN mostly happen in the scheduler and poller containers, which don't serve HTTP. In prod,
+each container's directory is a subdirectory of one shared volume (`METRICS_SHARED_DIR`), and `/metrics` sums up all of
+them. Each container keeps its own subdirectory, since the metrics files are named after process IDs, which are only
+unique within a container.
+"""
+
+from __future__ import annotations
+
+import glob
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+from flask import Flask, Response, current_app, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.metrics_core import Metric
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .models import db
+
+REQUEST_DURATION = Histogram(
+    "football_pool_request_duration_seconds",
+    "How long requests take to serve, per route.",
+    ["endpoint", "method", "status"],
+)
+ESPN_REQUEST_DURATION = Histogram(
+    "football_pool_espn_request_duration_seconds",
+    "How long each request to ESPN takes, including failed attempts.",
+)
+ESPN_ERRORS = Counter(
+    "football_pool_espn_errors_total",
+    "Errors querying ESPN: retried attempts, queries that failed every retry, and queries skipped by the breaker.",
+    ["kind"],
+)
+CACHE_LOOKUPS = Counter(
+    "football_pool_cache_lookups_total",
+    "Cache lookups, by cache and result (hit, miss, stale when an expired entry was served, or not_modified).",
+    ["cache", "result"],
+)
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "football_pool_db_pool_checkout_seconds",
+    "How long it takes to check a connection out of the database pool, including waiting for one to free up.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+JOB_DURATION = Histogram(
+    "football_pool_job_duration_seconds",
+    "How long scheduled jobs take to run, by job and outcome.",
+    ["job", "outcome"],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600),
+)
+
+
+@contextmanager
+def observe_job(job: str) -> Iterator[None]:
+    """Records how long a scheduled job takes to run, and whether it succeeded.
+
+    Args:
+        job (str): The name of the job.
+    """
+    start_time = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "success"
+    finally:
+        JOB_DURATION.labels(job=job, outcome=outcome).observe(time.perf_counter() - start_time)
+
+
+def _time_pool_checkouts(engine: Engine) -> None:
+    """Times every checkout from the engine's pool, by wrapping its `connect` (which is what the engine calls)."""
+    pool = engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        start_time = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT_DURATION.observe(time.perf_counter() - start_time)
+
+    pool.connect = timed_connect  # type: ignore[method-assign]
+
+
+@event.listens_for(Engine, "engine_disposed")
+def _retime_pool_checkouts(engine: Engine) -> None:
+    # disposing the engine replaces its pool
+    _time_pool_checkouts(engine)
+
+
+class SharedMultiProcessCollector:
+    """Sums up the metrics of every container's processes, each container writing to its own subdirectory."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def collect(self) -> Iterable[Metric]:
+        files = glob.glob(os.path.join(self.path, "*", "*.db"))
+        return multiprocess.MultiProcessCollector.merge(files, accumulate=True)
+
+
+def get_metrics_registry(shared_dir: str | None = None) -> CollectorRegistry:
+    """Gets the registry to serve metrics from: every process' metrics if multiprocess mode is on, or this one's.
+
+    Args:
+        shared_dir (str | None, optional): The directory holding each container's metrics directory, to serve every
+            container's metrics rather than only this one's. Defaults to None.
+
+    Returns:
+        CollectorRegistry: The registry of metrics to serve.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    if shared_dir is None:
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(SharedMultiProcessCollector(shared_dir))
+    return registry
+
+
+def init_metrics(app: Flask) -> None:
+    """Records the metrics of every request to the app and its database, and serves them from `/metrics`.
+
+    Args:
+        app (Flask): The app to record the metrics of.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            _time_pool_checkouts(engine)
+
+    @app.before_request
+    def start_request_metrics() -> None:
+        g.metrics_start_time = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response: Response) -> Response:
+        start_time = g.pop("metrics_start_time", None)
+        if start_time is not None:
+            REQUEST_DURATION.labels(
+                endpoint=request.endpoint or "none",
+                method=request.method,
+                status=response.status_code,
+            ).observe(time.perf_counter() - start_time)
+        return response
+
+    @app.route("/metrics")
+    def metrics() -> Response:
+        """Serves the metrics in Prometheus' text format.
+
+        Returns:
+            Response: The metrics.
+        """
+        registry = get_metrics_registry(current_app.config["METRICS_SHARED_DIR"])
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
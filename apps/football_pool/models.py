@@ -12,6 +12,7 @@ So the database should be focused around two things:
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime
 from enum import StrEnum
 
 from flask_sqlalchemy import SQLAlchemy
@@ -80,6 +81,18 @@ class Team(db.Model):
         """
         return hash(self.abbreviation)
 
+    def __eq__(self, other: object) -> bool:
+        """Compares Teams by their abbreviation, consistent with `__hash__`.
+
+        This avoids comparing relationships, which can't be loaded for the detached Teams in the team map.
+
+        Returns:
+            bool: Whether the Teams have the same abbreviation.
+        """
+        if not isinstance(other, Team):
+            return NotImplemented
+        return self.abbreviation == other.abbreviation
+
     @property
     def name_str(self) -> str:
         """Displays the team's name as a string."""
@@ -103,6 +116,10 @@ class Owner(db.Model):
     """Contains all team owners and their information."""
 
     __tablename__ = "owners"
+    __table_args__ = (
+        db.Index("ix_owners_season_start_year_team_id", "season_start_year", "team_id"),
+        db.Index("ix_owners_season_start_year_winnings", "season_start_year", "winnings"),
+    )
     id: Mapped[int] = db.Column(db.Integer, unique=True, primary_key=True)
     first_name: Mapped[str] = db.Column(db.String, nullable=False)
     last_name: Mapped[str] = db.Column(db.String, nullable=False)
@@ -121,7 +138,20 @@ class WinningGame(db.Model):
     """Contains all winning games, created via a scheduled job."""
 
     __tablename__ = "winning_games"
+    __table_args__ = (
+        db.Index("ix_winning_games_season_start_year_week", "season_start_year", "week"),
+        # a team can only win each way once a week, so settling a week again can't pay it twice
+        db.UniqueConstraint(
+            "season_start_year",
+            "season_type",
+            "week",
+            "team_id",
+            "winning_type",
+            name="winning_games_season_week_team_id_winning_type_key",
+        ),
+    )
     id: Mapped[int] = db.Column(db.Integer, unique=True, primary_key=True)
+    season_type: Mapped[str] = db.Column(db.String, nullable=False)  # the week's `SeasonType`, each numbers from 1
     week: Mapped[int] = db.Column(db.Integer, nullable=False)
     winnings: Mapped[int] = db.Column(db.Integer, nullable=False)
     winning_type: Mapped[WinningType] = db.Column(db.Enum(WinningType), nullable=False)
@@ -137,3 +167,40 @@ class Pot(db.Model):
     __tablename__ = "pot"
     id: Mapped[int] = db.Column(db.Integer, unique=True, primary_key=True)
     amount: Mapped[int] = db.Column(db.Integer, nullable=False)
+
+
+@dataclass
+class LeaderboardEntry(db.Model):
+    """An owner's standing in a season, refreshed from the winning games whenever they're written."""
+
+    __tablename__ = "season_leaderboard"
+    __table_args__ = (db.Index("ix_season_leaderboard_season_start_year_rank", "season_start_year", "rank"),)
+    id: Mapped[int] = db.Column(db.Integer, unique=True, primary_key=True)
+    owner_id: Mapped[int] = db.Column(db.Integer, db.ForeignKey("owners.id"), unique=True, nullable=False)
+    owner: Mapped[Owner] = db.relationship("Owner", lazy="joined")  # type: ignore
+    season_start_year: Mapped[int] = db.Column(db.Integer, nullable=False)
+    winnings: Mapped[int] = db.Column(db.Integer, nullable=False, default=0)
+    most_wins: Mapped[int] = db.Column(db.Integer, nullable=False, default=0)
+    least_wins: Mapped[int] = db.Column(db.Integer, nullable=False, default=0)
+    fifty_wins: Mapped[int] = db.Column(db.Integer, nullable=False, default=0)
+    playoff_wins: Mapped[int] = db.Column(db.Integer, nullable=False, default=0)
+    super_bowl_wins: Mapped[int] = db.Column(db.Integer, nullable=False, default=0)
+    rank: Mapped[int] = db.Column(db.Integer, nullable=False)
+
+    @property
+    def name_str(self) -> str:
+        """Displays the owner's name as a string."""
+        return self.owner.name_str
+
+
+@dataclass
+class SettledWeek(db.Model):
+    """Marks a week whose results have been written, so that it's never settled (and paid out) twice."""
+
+    __tablename__ = "settled_weeks"
+    __table_args__ = (db.UniqueConstraint("season_start_year", "season_type", "week"),)
+    id: Mapped[int] = db.Column(db.Integer, unique=True, primary_key=True)
+    season_start_year: Mapped[int] = db.Column(db.Integer, nullable=False)
+    season_type: Mapped[str] = db.Column(db.String, nullable=False)  # the week's `SeasonType`
+    week: Mapped[int] = db.Column(db.Integer, nullable=False)
+    settled_at: Mapped[datetime] = db.Column(db.DateTime(timezone=True), nullable=False, server_default=db.func.now())
@@ -0,0 +1,269 @@
+"""A cache of rendered pages, shared by every gunicorn worker on the host.
+
+Pages like `/results` and `/assignments` only depend on the selected season (from the `season_start_year` cookie)
+and the theme, and a season's data only changes when a transaction writes to it. So rendered pages are stored as
+files in the `CACHE_DIR`, keyed by (view, season, theme), and kept until that season changes: past seasons are
+effectively cached forever, and browsing them never touches the database.
+
+Whenever a transaction changes a season's owners, winning games or leaderboard (as `write_to_db` does every week),
+that season's version file is touched once it commits, and its pages are re-rendered on their next request.
+A change to any team touches the version file shared by every season.
+
+The same versions make up the pages' ETags and Last-Modified dates, so that a browser reloading a page that hasn't
+changed gets a 304 before anything is read or rendered.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+
+from flask import Response, current_app, g, make_response, request
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from werkzeug.http import is_resource_modified
+
+from .metrics import CACHE_LOOKUPS
+from .models import LeaderboardEntry, Owner, Team, WinningGame
+from .years import get_current_season_start_year, get_selected_season_start_year
+
+ALL_SEASONS = "all"
+
+
+class PageCache:
+    """A file-backed cache of rendered pages, versioned per season."""
+
+    def __init__(self, cache_dir: Path, templates_dir: Path) -> None:
+        self.cache_dir = cache_dir / "pages"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # templates only change with a deploy, so their version is read once
+        self.templates_version = max(path.stat().st_mtime_ns for path in templates_dir.rglob("*.html"))
+
+    def _version_path(self, season: int | str) -> Path:
+        return self.cache_dir / f"{season}.version"
+
+    def _version(self, season: int | str) -> int:
+        try:
+            return self._version_path(season).stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def version(self, season_start_year: int) -> str:
+        """Gets the version of a season's data, which changes whenever the season (or any team) changes.
+
+        The current season is part of it too, since every page's season dropdown depends on it, along with the
+        version of the templates.
+
+        Args:
+            season_start_year (int): The year in which the season started.
+
+        Returns:
+            str: The season's version.
+        """
+        return "-".join(
+            str(part)
+            for part in (
+                self._version(season_start_year),
+                self._version(ALL_SEASONS),
+                get_current_season_start_year(),
+                self.templates_version,
+            )
+        )
+
+    def last_modified(self, season_start_year: int) -> datetime | None:
+        """Gets when a season's data last changed, if it's known.
+
+        Args:
+            season_start_year (int): The year in which the season started.
+
+        Returns:
+            datetime | None: When the season (or any team) last changed, or None if it hasn't been since caching.
+        """
+        mtime_ns = max(self._version(season_start_year), self._version(ALL_SEASONS), self.templates_version)
+        if not mtime_ns:
+            return None
+        return datetime.fromtimestamp(mtime_ns / 1e9, tz=timezone.utc)
+
+    def etag(self, view: str, season_start_year: int, theme: str, version: str) -> str:
+        """Gets the strong ETag of the page rendered for the view, season and theme.
+
+        Args:
+            view (str): The name of the view.
+            season_start_year (int): The year in which the selected season started.
+            theme (str): The selected theme.
+            version (str): The season's version.
+
+        Returns:
+            str: The page's ETag.
+        """
+        key = f"{view}:{season_start_year}:{theme}:{version}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _page_path(self, view: str, season_start_year: int, theme: str, version: str) -> Path:
+        return self.cache_dir / f"{season_start_year}.{view}.{theme}.{version}.html"
+
+    def get(self, view: str, season_start_year: int, theme: str, version: str) -> str | None:
+        """Gets the page rendered for the view, season and theme at the season's version.
+
+        Args:
+            view (str): The name of the view.
+            season_start_year (int): The year in which the selected season started.
+            theme (str): The selected theme.
+            version (str): The season's version.
+
+        Returns:
+            str | None: The rendered page, or None if it isn't cached.
+        """
+        try:
+            return self._page_path(view, season_start_year, theme, version).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def set(self, view: str, season_start_year: int, theme: str, version: str, page: str) -> None:
+        """Stores the page rendered for the view, season and theme, atomically replacing any previous one.
+
+        The version must be the one read before the page was rendered: if the season changes while it's rendering,
+        the page is stored under the superseded version, and never served.
+
+        Args:
+            view (str): The name of the view.
+            season_start_year (int): The year in which the selected season started.
+            theme (str): The selected theme.
+            version (str): The season's version, read before the page was rendered.
+            page (str): The rendered page.
+        """
+        page_path = self._page_path(view, season_start_year, theme, version)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as outfile:
+                outfile.write(page)
+            os.replace(tmp_path, page_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        # prune the page's other versions (e.g. from before a deploy, or stored while the season was changing)
+        for other_path in self.cache_dir.glob(f"{season_start_year}.{view}.{theme}.*.html"):
+            if other_path != page_path:
+                other_path.unlink(missing_ok=True)
+
+    def invalidate(self, season_start_year: int | None = None) -> None:
+        """Makes every worker on the host re-render a season's pages, or every season's if no season is given.
+
+        Args:
+            season_start_year (int | None, optional): The season that changed. Defaults to None, for all seasons.
+        """
+        season: int | str = ALL_SEASONS if season_start_year is None else season_start_year
+        self._version_path(season).touch()
+        pattern = "*.html" if season_start_year is None else f"{season_start_year}.*.html"
+        for page_path in self.cache_dir.glob(pattern):
+            page_path.unlink(missing_ok=True)  # a worker still reading it keeps its open file
+        current_app.logger.info("Invalidated the cached pages of season '%s'.", season)
+
+
+def get_page_cache() -> PageCache:
+    """Gets the page cache for the current app, creating it on first use.
+
+    Returns:
+        PageCache: The app's page cache.
+    """
+    cache = current_app.extensions.get("page_cache")
+    if cache is None:
+        cache = PageCache(
+            cache_dir=current_app.config["CACHE_DIR"],
+            templates_dir=Path(current_app.root_path) / "templates",
+        )
+        current_app.extensions["page_cache"] = cache
+    return cache
+
+
+def cached_page(view: Callable[..., str]) -> Callable[..., Response]:
+    """Decorates a view whose page only depends on the selected season and theme, to serve it from the cache.
+
+    The page is served with its ETag and Last-Modified date, and conditional requests for an unchanged page
+    are answered with a 304 straight away.
+
+    Args:
+        view (Callable[..., str]): The view, returning its rendered page.
+
+    Returns:
+        Callable[..., Response]: The view, cached per season and theme.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs) -> Response:
+        season_start_year = get_selected_season_start_year()
+        theme = g.get("theme", "")
+        cache = get_page_cache()
+        # read once, before rendering, so that a page rendered from data that's since changed isn't stored as current
+        version = cache.version(season_start_year)
+        etag = cache.etag(view.__name__, season_start_year, theme, version)
+        last_modified = cache.last_modified(season_start_year)
+        if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            page = cache.get(view.__name__, season_start_year, theme, version)
+            CACHE_LOOKUPS.labels(cache="page", result="miss" if page is None else "hit").inc()
+            if page is None:
+                current_app.logger.debug("Rendering the '%s' page of season '%s'.", view.__name__, season_start_year)
+                page = view(*args, **kwargs)
+                cache.set(view.__name__, season_start_year, theme, version, page)
+            response = make_response(page)
+        else:
+            CACHE_LOOKUPS.labels(cache="page", result="not_modified").inc()
+            response = make_response("", 304)
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        # the page depends on the season and theme cookies, and browsers must check that it's still current
+        response.vary.add("Cookie")
+        response.cache_control.no_cache = True
+        return response
+
+    return wrapper
+
+
+def mark_season_changed(session: Session, season_start_year: int | None) -> None:
+    """Flags a season's pages for invalidation once the session commits.
+
+    Changes made through the ORM are flagged automatically; bulk statements must flag the seasons they change.
+
+    Args:
+        session (Session): The session making the change.
+        season_start_year (int | None): The season that changed, or None for every season.
+    """
+    session.info.setdefault("page_seasons_changed", set()).add(season_start_year)
+
+
+@event.listens_for(Owner, "after_insert")
+@event.listens_for(Owner, "after_update")
+@event.listens_for(Owner, "after_delete")
+@event.listens_for(WinningGame, "after_insert")
+@event.listens_for(WinningGame, "after_update")
+@event.listens_for(WinningGame, "after_delete")
+@event.listens_for(LeaderboardEntry, "after_insert")
+@event.listens_for(LeaderboardEntry, "after_update")
+@event.listens_for(LeaderboardEntry, "after_delete")
+def _flag_season_changed(mapper, connection, target: Owner | WinningGame | LeaderboardEntry) -> None:
+    session = object_session(target)
+    if session is not None:
+        mark_season_changed(session, target.season_start_year)
+
+
+@event.listens_for(Team, "after_insert")
+@event.listens_for(Team, "after_update")
+@event.listens_for(Team, "after_delete")
+def _flag_all_seasons_changed(mapper, connection, target: Team) -> None:
+    session = object_session(target)
+    if session is not None:
+        mark_season_changed(session, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_seasons(session: Session) -> None:
+    seasons: set[int | None] = session.info.pop("page_seasons_changed", set())
+    if None in seasons:
+        seasons = {None}
+    for season_start_year in seasons:
+        get_page_cache().invalidate(season_start_year)
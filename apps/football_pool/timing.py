@@ -0,0 +1,129 @@
+"""Request-scoped timing of each phase of a request, reported via a `Server-Timing` header and a log line.
+
+Phases are timed with `timed(...)`, which adds to the phase's total for the current request (and does nothing
+outside of one), so the same phase can be timed more than once per request. Database queries and template rendering
+are timed through SQLAlchemy events and Flask signals. Timing only costs a couple of `perf_counter` calls per phase,
+so it's meant to be left on in production.
+
+Phases:
+- `scoreboard`: Getting the scoreboard snapshot from the shared cache (including any refresh).
+- `espn`: Querying ESPN.
+- `parse`: Parsing a snapshot into a CurrentWeek.
+- `teams`: Looking up Teams in the team map.
+- `winners`: Computing the week's winners.
+- `db`: Running database queries.
+- `render`: Rendering templates.
+- `total`: The whole request.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Iterator
+
+from flask import (
+    Flask,
+    Response,
+    before_render_template,
+    current_app,
+    g,
+    has_request_context,
+    request,
+    template_rendered,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Times the block as (part of) a phase of the current request.
+
+    Args:
+        phase (str): The name of the phase.
+    """
+    timings: defaultdict[str, float] | None = g.get("timings") if has_request_context() else None
+    if timings is None:
+        yield
+        return
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] += time.perf_counter() - start_time
+
+
+def _start_phase(phase: str) -> None:
+    if has_request_context() and "timings" in g:
+        g.phase_starts[phase] = time.perf_counter()
+
+
+def _end_phase(phase: str) -> None:
+    if has_request_context() and "timings" in g:
+        start_time = g.phase_starts.pop(phase, None)
+        if start_time is not None:
+            g.timings[phase] += time.perf_counter() - start_time
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _start_phase("db")
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _end_phase("db")
+
+
+def _before_render_template(sender, template, context, **extra) -> None:
+    _start_phase("render")
+
+
+def _template_rendered(sender, template, context, **extra) -> None:
+    _end_phase("render")
+
+
+def init_request_timing(app: Flask) -> None:
+    """Times every request to the app, if `REQUEST_TIMING` is enabled.
+
+    Args:
+        app (Flask): The app to time the requests of.
+    """
+    if not app.config["REQUEST_TIMING"]:
+        return
+
+    before_render_template.connect(_before_render_template, app)
+    template_rendered.connect(_template_rendered, app)
+
+    @app.before_request
+    def start_request_timing() -> None:
+        g.timings = defaultdict(float)
+        g.phase_starts = {}
+        g.request_start_time = time.perf_counter()
+
+    @app.after_request
+    def report_request_timing(response: Response) -> Response:
+        if "timings" not in g:
+            return response
+        timings: dict[str, float] = dict(g.timings)
+        timings["total"] = time.perf_counter() - g.request_start_time
+        response.headers["Server-Timing"] = ", ".join(
+            f"{phase};dur={duration * 1000:.2f}" for phase, duration in timings.items()
+        )
+        current_app.logger.info(
+            "request %s",
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "endpoint": request.endpoint,
+                    "status": response.status_code,
+                    "timings_ms": {phase: round(duration * 1000, 2) for phase, duration in timings.items()},
+                },
+                separators=(",", ":"),
+            ),
+        )
+        return response
@@ -1,13 +1,25 @@
 from __future__ import annotations
 
+from datetime import datetime
 from enum import StrEnum
 from pathlib import Path
 
-from flask import Blueprint, Response, current_app, make_response, render_template, request
-
-from .get_scores import get_live_scores
-from .models import Owner, Pot, WinningGame
-from .years import get_current_season_start_year
+from flask import Blueprint, Response, abort, current_app, jsonify, make_response, render_template, request
+from sqlalchemy import case, select
+from sqlalchemy.orm import contains_eager
+
+from .get_scores.broadcast import get_scoreboard_broadcaster
+from .get_scores.cache import ScoreboardSnapshot, get_scoreboard_cache
+from .get_scores.client import get_espn_client
+from .get_scores.exceptions import ESPNUnavailableError
+from .get_scores.make_games import EST, CurrentWeek, SeasonType
+from .get_scores.poller import get_poll_interval
+from .get_scores.query import get_live_snapshot
+from .get_scores.write_to_db import get_owners_by_team_id
+from .health import check_readiness
+from .models import LeaderboardEntry, Owner, Pot, Team, WinningGame, db
+from .page_cache import cached_page
+from .years import get_current_season_start_year, get_selected_season_start_year, list_of_tracked_seasons
 
 __APPPATH = Path(__file__).parent
 
@@ -19,61 +31,212 @@ app_blueprint = Blueprint(
 )
 
 
-@app_blueprint.route("/")
-def index():
-    current_week = get_live_scores()
+def _get_stale_as_of(snapshot: ScoreboardSnapshot) -> datetime | None:
+    """Gets when a snapshot was fetched, if it's been stale for long enough that the page should say so."""
+    if get_scoreboard_cache().overdue(snapshot) <= current_app.config["SCOREBOARD_STALE_NOTICE"].total_seconds():
+        return None
+    return datetime.fromtimestamp(snapshot.fetched_at, tz=EST)
+
+
+def _get_scoreboard_digest(snapshot: ScoreboardSnapshot, stale_as_of: datetime | None) -> str:
+    """Gets the digest of the rendered scoreboard, which changes with the snapshot or its stale notice."""
+    return snapshot.digest if stale_as_of is None else f"{snapshot.digest}-stale"
+
+
+def _get_scoreboard_context(snapshot: ScoreboardSnapshot, current_week: CurrentWeek) -> dict:
+    """Gets everything needed to render the scoreboard fragment: the game cards and the currently winning panel.
+
+    Args:
+        snapshot (ScoreboardSnapshot): The latest scoreboard snapshot.
+        current_week (CurrentWeek): The CurrentWeek parsed from the snapshot.
+
+    Returns:
+        dict: The scoreboard fragment's template context.
+    """
+    stale_as_of = _get_stale_as_of(snapshot)
     sorted_games = sorted(current_week.games, key=lambda game: game.gametime)
-    winning_teams = current_week.get_pool_winning_teams()
+    winners = current_week.get_winners()
+    winning_teams = winners.pool_winning_teams
+    winners_by_type = winners.by_winning_type
     if len(winning_teams) >= 16:
         current_app.logger.debug(
             "It's likely that there aren't 16 teams actually winning the pool. Not rendering winners."
         )
-        winning_teams = []
+        winning_teams, winners_by_type = set(), []
+    owners_by_team_id = get_owners_by_team_id(get_current_season_start_year()) if winners_by_type else {}
+    return {
+        "current_week": current_week,
+        "sorted_games": sorted_games,
+        "winning_teams": winning_teams,
+        "winners_by_type": winners_by_type,
+        "owners_by_team_id": owners_by_team_id,
+        "scoreboard_digest": _get_scoreboard_digest(snapshot, stale_as_of),
+        "stale_as_of": stale_as_of,
+        "poll_seconds": max(1, round(get_poll_interval(current_week).total_seconds())),
+    }
+
+
+def _get_unavailable_scoreboard_context(error: ESPNUnavailableError) -> dict:
+    """Gets the scoreboard fragment's template context for when there's no scoreboard to serve.
+
+    Args:
+        error (ESPNUnavailableError): Why there's no scoreboard.
+
+    Returns:
+        dict: The scoreboard fragment's template context, which keeps polling until there is a scoreboard.
+    """
+    current_app.logger.warning("%s There's no scoreboard to serve.", error)
+    return {
+        "current_week": None,
+        "scoreboard_unavailable": True,
+        "scoreboard_error": str(error) if current_app.config["SCOREBOARD_SHOW_ERRORS"] else None,
+        "scoreboard_digest": "unavailable",
+        "poll_seconds": max(1, round(current_app.config["SCOREBOARD_POLL_RETRY"].total_seconds())),
+    }
+
+
+@app_blueprint.route("/")
+def index() -> tuple[str, int]:
+    """Renders the home page with the live scoreboard, or a notice if it's unavailable.
+
+    Returns:
+        tuple[str, int]: The rendered page, with a 200, or a 503 if the scoreboard is unavailable.
+    """
+    try:
+        snapshot, current_week = get_live_snapshot()
+    except ESPNUnavailableError as error:
+        scoreboard_context, status = _get_unavailable_scoreboard_context(error), 503
+    else:
+        scoreboard_context, status = _get_scoreboard_context(snapshot, current_week), 200
     pot = Pot.query.one()
-    return render_template(
+    page = render_template(
         "index.html",
-        current_week=current_week,
-        sorted_games=sorted_games,
-        winning_teams=winning_teams,
         pot=pot,
+        scoreboard_stream_url=current_app.config["SCOREBOARD_STREAM_URL"],
+        **scoreboard_context,
+    )
+    return page, status
+
+
+def _scoreboard_unchanged() -> Response:
+    """Tells HTMX that the scoreboard hasn't changed, so there's nothing to swap."""
+    response = make_response("", 204)
+    response.headers["HX-Reswap"] = "none"
+    return response
+
+
+@app_blueprint.route("/scoreboard")
+def scoreboard() -> Response | str:
+    """Provides the live scoreboard fragment, polled by HTMX from the home page.
+
+    The page sends the digest of the scoreboard it's showing, so if the scoreboard hasn't changed since,
+    nothing is rendered and HTMX is told not to swap anything. If the scoreboard is unavailable, the fragment is
+    a notice (with a 200, since HTMX doesn't swap errors in) which keeps polling until it's back.
+
+    Returns:
+        Response | str: The rendered fragment, or an empty 204 if the scoreboard hasn't changed.
+    """
+    try:
+        snapshot, current_week = get_live_snapshot()
+    except ESPNUnavailableError as error:
+        if request.args.get("digest") == "unavailable":
+            return _scoreboard_unchanged()
+        return render_template("scoreboard.html", **_get_unavailable_scoreboard_context(error))
+    if request.args.get("digest") == _get_scoreboard_digest(snapshot, _get_stale_as_of(snapshot)):
+        return _scoreboard_unchanged()
+    return render_template("scoreboard.html", **_get_scoreboard_context(snapshot, current_week))
+
+
+@app_blueprint.route("/stream/scoreboard")
+def stream_scoreboard() -> Response:
+    """Streams the live scoreboard's changes as Server-Sent Events, starting with a snapshot of the week.
+
+    Streams stay open for as long as the browser is connected, so this is only served by the async workers that set
+    `SCOREBOARD_STREAM_SERVE`. Anywhere else, it's a 404 rather than a sync worker held for good.
+
+    Returns:
+        Response: The stream of scoreboard events.
+    """
+    if not current_app.config["SCOREBOARD_STREAM_SERVE"]:
+        abort(404)
+    broadcaster = get_scoreboard_broadcaster()
+    subscription = broadcaster.subscribe()
+    keepalive = current_app.config["SCOREBOARD_STREAM_KEEPALIVE"]
+
+    def stream():
+        try:
+            yield from subscription.events(keepalive)
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
 @app_blueprint.route("/assignments")
+@cached_page
 def assignments():
-    season_start_year = int(request.cookies.get("season_start_year", get_current_season_start_year()))
-    cur_year_owners: list[Owner] = Owner.query.where(Owner.season_start_year == season_start_year).all()
-    owners: list[Owner] = sorted(cur_year_owners, key=lambda x: x.team.name_str)
+    season_start_year = get_selected_season_start_year()
+    # one query for the season's owners along with their teams, ordered by the teams' names
+    owners: list[Owner] = (
+        db.session.execute(
+            select(Owner)
+            .join(Owner.team)
+            .options(contains_eager(Owner.team))
+            .where(Owner.season_start_year == season_start_year)
+            .order_by(Team.city, Team.name)
+        )
+        .scalars()
+        .all()
+    )
     return render_template("assignments.html", owners=owners, show_year_dropdown=True)
 
 
 @app_blueprint.route("/results")
+@cached_page
 def results():
-    season_start_year = int(request.cookies.get("season_start_year", get_current_season_start_year()))
-    winning_games: list[WinningGame] = (
-        WinningGame.query.where(WinningGame.season_start_year == season_start_year).order_by(WinningGame.week).all()
-    )
+    season_start_year = get_selected_season_start_year()
+    # one query for every winning game, along with its team and the team's owner that season (if any)
+    winning_game_rows = db.session.execute(
+        select(WinningGame, Owner)
+        .join(WinningGame.team)
+        .outerjoin(
+            Owner,
+            (Owner.team_id == WinningGame.team_id) & (Owner.season_start_year == WinningGame.season_start_year),
+        )
+        .options(contains_eager(WinningGame.team))
+        .where(WinningGame.season_start_year == season_start_year)
+        # the postseason's weeks are numbered from 1 again, so they're listed after the regular season's
+        .order_by(
+            case((WinningGame.season_type == SeasonType.POSTSEASON, 1), else_=0), WinningGame.week, WinningGame.id
+        )
+    ).all()
     name_and_winning_game_list: list[tuple[str, WinningGame]] = []
-    for winning_game in winning_games:
-        owner: Owner | None = Owner.query.where(
-            (Owner.team_id == winning_game.team_id) & (Owner.season_start_year == season_start_year)
-        ).one_or_none()
+    for winning_game, owner in winning_game_rows:
         winning_owner_str = owner.name_str if owner else "No one (Rigged!!!)"
         name_and_winning_game_list.append((winning_owner_str, winning_game))
-    winning_owners = (
-        Owner.query.where((Owner.winnings > 0) & (Owner.season_start_year == season_start_year))
-        .order_by(Owner.winnings.desc())
+    leaderboard: list[LeaderboardEntry] = (
+        db.session.execute(
+            select(LeaderboardEntry)
+            .where((LeaderboardEntry.season_start_year == season_start_year) & (LeaderboardEntry.winnings > 0))
+            .order_by(LeaderboardEntry.rank)
+        )
+        .scalars()
         .all()
     )
     return render_template(
         "results.html",
         name_and_winning_game_list=name_and_winning_game_list,
-        winning_owners=winning_owners,
+        leaderboard=leaderboard,
         show_year_dropdown=True,
     )
 
 
 @app_blueprint.route("/about")
+@cached_page
 def about():
     return render_template("about.html")
 
@@ -125,7 +288,11 @@ class Theme(StrEnum):
 @app_blueprint.route("/set-year", methods=["POST"])
 def set_year():
     season_start_year = request.form.get("season_start_year")
-    if not season_start_year or not season_start_year.isdigit():
+    if (
+        not season_start_year
+        or not season_start_year.isdigit()
+        or int(season_start_year) not in list_of_tracked_seasons()
+    ):
         current_app.logger.debug("season_start_year='%s' failed validation.", season_start_year)
         return "Invalid year", 400
 
@@ -150,10 +317,32 @@ def swap_theme_cookie() -> Response:
 
 
 @app_blueprint.route("/healthcheck", methods=["GET"])
+@app_blueprint.route("/healthcheck/live", methods=["GET"])
 def healthcheck() -> str:
-    """Provides an endpoint to make healthchecks possible.
+    """Provides a liveness probe, which doesn't touch the database or ESPN.
 
     Returns:
-        str: The str "ok", if healthy.
+        str: The str "ok", if the worker is serving requests.
     """
     return "ok"
+
+
+@app_blueprint.route("/healthcheck/ready", methods=["GET"])
+def readiness() -> tuple[Response, int]:
+    """Provides a readiness probe, checking the database pool and reporting the scoreboard's freshness.
+
+    Returns:
+        tuple[Response, int]: The JSON result of each check, with a 200 if the worker is ready or a 503 if not.
+    """
+    ready, checks = check_readiness()
+    return jsonify({"ready": ready, **checks}), 200 if ready else 503
+
+
+@app_blueprint.route("/healthcheck/espn", methods=["GET"])
+def espn_client_stats() -> Response:
+    """Provides the ESPN client's latency, retry and circuit breaker counters for this worker.
+
+    Returns:
+        Response: The JSON counters of this worker's ESPN client.
+    """
+    return jsonify(get_espn_client().stats_dict())
@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+from flask import request
+
 FIRST_SEASON = 2024
 
 
@@ -39,3 +41,18 @@ def list_of_tracked_seasons() -> list[int]:
     Useful for dropdowns
     """
     return list(range(FIRST_SEASON, get_current_season_start_year() + 1))
+
+
+def get_selected_season_start_year() -> int:
+    """Gets the season selected with the `season_start_year` cookie, for the current request.
+
+    Anything but a season we've tracked (e.g. a cookie set by hand) falls back on the current season, so that
+    pages are only ever rendered (and cached) for a season that exists.
+
+    Returns:
+        int: The year in which the selected season started.
+    """
+    season_start_year = request.cookies.get("season_start_year", "")
+    if season_start_year.isdigit() and int(season_start_year) in list_of_tracked_seasons():
+        return int(season_start_year)
+    return get_current_season_start_year()
@@ -0,0 +1,33 @@
+"""Add composite indexes on the season filters.
+
+Revision ID: 3f9a1c7e2b4d
+Revises: d51670f25756
+Create Date: 2026-10-18 10:12:41.503227
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f9a1c7e2b4d"
+down_revision = "d51670f25756"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("owners", schema=None) as batch_op:
+        batch_op.create_index("ix_owners_season_start_year_team_id", ["season_start_year", "team_id"], unique=False)
+        batch_op.create_index("ix_owners_season_start_year_winnings", ["season_start_year", "winnings"], unique=False)
+
+    with op.batch_alter_table("winning_games", schema=None) as batch_op:
+        batch_op.create_index("ix_winning_games_season_start_year_week", ["season_start_year", "week"], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table("winning_games", schema=None) as batch_op:
+        batch_op.drop_index("ix_winning_games_season_start_year_week")
+
+    with op.batch_alter_table("owners", schema=None) as batch_op:
+        batch_op.drop_index("ix_owners_season_start_year_winnings")
+        batch_op.drop_index("ix_owners_season_start_year_team_id")
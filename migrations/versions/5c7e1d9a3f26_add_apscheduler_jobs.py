@@ -0,0 +1,36 @@
+"""Add the scheduler worker's job store.
+
+Revision ID: 5c7e1d9a3f26
+Revises: 8e2d4b6a9c10
+Create Date: 2026-10-18 15:22:47.913205
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c7e1d9a3f26"
+down_revision = "8e2d4b6a9c10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the job store creates its table itself when it starts, so a worker started before migrating may have already
+    if sa.inspect(op.get_bind()).has_table("apscheduler_jobs"):
+        return
+    # the schema of apscheduler's `SQLAlchemyJobStore`, which `flask pool worker` persists its jobs in
+    op.create_table(
+        "apscheduler_jobs",
+        sa.Column("id", sa.Unicode(length=191), nullable=False),
+        sa.Column("next_run_time", sa.Float(precision=25), nullable=True),
+        sa.Column("job_state", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_apscheduler_jobs_next_run_time", "apscheduler_jobs", ["next_run_time"], unique=False)
+
+
+def downgrade():
+    op.drop_index("ix_apscheduler_jobs_next_run_time", table_name="apscheduler_jobs")
+    op.drop_table("apscheduler_jobs")
@@ -0,0 +1,74 @@
+"""Add the season leaderboard.
+
+Revision ID: 8e2d4b6a9c10
+Revises: 3f9a1c7e2b4d
+Create Date: 2026-10-18 11:04:19.228716
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8e2d4b6a9c10"
+down_revision = "3f9a1c7e2b4d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "season_leaderboard",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column("season_start_year", sa.Integer(), nullable=False),
+        sa.Column("winnings", sa.Integer(), nullable=False),
+        sa.Column("most_wins", sa.Integer(), nullable=False),
+        sa.Column("least_wins", sa.Integer(), nullable=False),
+        sa.Column("fifty_wins", sa.Integer(), nullable=False),
+        sa.Column("playoff_wins", sa.Integer(), nullable=False),
+        sa.Column("super_bowl_wins", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["owner_id"], ["owners.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("id"),
+        sa.UniqueConstraint("owner_id"),
+    )
+    with op.batch_alter_table("season_leaderboard", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_season_leaderboard_season_start_year_rank", ["season_start_year", "rank"], unique=False
+        )
+
+    # backfill every season from the winning games written so far
+    op.execute(
+        """
+        INSERT INTO season_leaderboard (
+            owner_id, season_start_year, winnings,
+            most_wins, least_wins, fifty_wins, playoff_wins, super_bowl_wins, rank
+        )
+        SELECT
+            owners.id,
+            owners.season_start_year,
+            COALESCE(SUM(winning_games.winnings), 0),
+            COUNT(winning_games.id) FILTER (WHERE winning_games.winning_type = 'MOST'),
+            COUNT(winning_games.id) FILTER (WHERE winning_games.winning_type = 'LEAST'),
+            COUNT(winning_games.id) FILTER (WHERE winning_games.winning_type = 'FIFTY'),
+            COUNT(winning_games.id) FILTER (WHERE winning_games.winning_type = 'PLAYOFF'),
+            COUNT(winning_games.id) FILTER (WHERE winning_games.winning_type = 'SUPER_BOWL'),
+            RANK() OVER (
+                PARTITION BY owners.season_start_year ORDER BY COALESCE(SUM(winning_games.winnings), 0) DESC
+            )
+        FROM owners
+        LEFT OUTER JOIN winning_games
+            ON winning_games.team_id = owners.team_id
+            AND winning_games.season_start_year = owners.season_start_year
+        GROUP BY owners.id, owners.season_start_year
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("season_leaderboard", schema=None) as batch_op:
+        batch_op.drop_index("ix_season_leaderboard_season_start_year_rank")
+
+    op.drop_table("season_leaderboard")
@@ -0,0 +1,46 @@
+"""Add the settled weeks.
+
+Revision ID: b2f8e4c61d07
+Revises: 5c7e1d9a3f26
+Create Date: 2026-10-18 16:41:05.381920
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b2f8e4c61d07"
+down_revision = "5c7e1d9a3f26"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "settled_weeks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("season_start_year", sa.Integer(), nullable=False),
+        sa.Column("season_type", sa.String(), nullable=False),
+        sa.Column("week", sa.Integer(), nullable=False),
+        sa.Column("settled_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("id"),
+        sa.UniqueConstraint("season_start_year", "season_type", "week"),
+    )
+    # every week settled so far has winners of its own type, so mark those weeks as settled
+    op.execute(
+        """
+        INSERT INTO settled_weeks (season_start_year, season_type, week)
+        SELECT DISTINCT
+            season_start_year,
+            CASE WHEN winning_type IN ('PLAYOFF', 'SUPER_BOWL') THEN 'POSTSEASON' ELSE 'REGULAR_SEASON' END,
+            week
+        FROM winning_games
+        WHERE winning_type != 'FIFTY'
+        """
+    )
+
+
+def downgrade():
+    op.drop_table("settled_weeks")
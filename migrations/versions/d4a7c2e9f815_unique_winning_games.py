@@ -0,0 +1,75 @@
+"""Make winning games unique per season, season type, week, team and winning type.
+
+Revision ID: d4a7c2e9f815
+Revises: b2f8e4c61d07
+Create Date: 2026-10-18 17:30:52.604117
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d4a7c2e9f815"
+down_revision = "b2f8e4c61d07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("winning_games", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("season_type", sa.String(), nullable=True))
+    # a week's winners are of its own type, like when the settled weeks were marked
+    op.execute(
+        """
+        UPDATE winning_games
+        SET season_type = CASE
+            WHEN winning_type IN ('PLAYOFF', 'SUPER_BOWL') THEN 'POSTSEASON' ELSE 'REGULAR_SEASON'
+        END
+        WHERE winning_type != 'FIFTY'
+        """
+    )
+    # a 50-point win was inserted right after its week's winners, so it's of the same type as the last one before it
+    op.execute(
+        """
+        UPDATE winning_games
+        SET season_type = COALESCE(
+            (
+                SELECT winners.season_type
+                FROM winning_games AS winners
+                WHERE winners.season_start_year = winning_games.season_start_year
+                    AND winners.week = winning_games.week
+                    AND winners.winning_type != 'FIFTY'
+                    AND winners.id < winning_games.id
+                ORDER BY winners.id DESC
+                LIMIT 1
+            ),
+            'REGULAR_SEASON'
+        )
+        WHERE winning_type = 'FIFTY'
+        """
+    )
+    # drop any winning game written twice by a re-run settlement, keeping the first. Only exact copies are dropped:
+    # two that differ in anything but their ID are both kept, and the unique constraint below fails on them instead
+    op.execute(
+        """
+        DELETE FROM winning_games
+        WHERE id NOT IN (
+            SELECT min(id)
+            FROM winning_games
+            GROUP BY season_start_year, season_type, week, team_id, winning_type, winnings
+        )
+        """
+    )
+    with op.batch_alter_table("winning_games", schema=None) as batch_op:
+        batch_op.alter_column("season_type", existing_type=sa.String(), nullable=False)
+        batch_op.create_unique_constraint(
+            "winning_games_season_week_team_id_winning_type_key",
+            ["season_start_year", "season_type", "week", "team_id", "winning_type"],
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("winning_games", schema=None) as batch_op:
+        batch_op.drop_constraint("winning_games_season_week_team_id_winning_type_key", type_="unique")
+        batch_op.drop_column("season_type")
@@ -20,11 +20,21 @@ if [[ "${OLD_UID}" != "${PUID}" ]]; then
     find / -user "${OLD_UID}" -exec chown "${PUID}" {} + 2>/dev/null
 fi
 
-# migrate the database if needed
-echo "INFO: Beginning database migrations..."
-flask db upgrade
-flask db stamp head
-echo "INFO: Completed database migrations!"
+# clear the metrics of the container's previous run, which would otherwise be summed into this one's
+# (only this container's: the other containers' directories on the shared metrics volume are left alone)
+if [ -n "${PROMETHEUS_MULTIPROC_DIR}" ]; then
+    rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+    mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+    chown "${USER_NAME}:${USER_NAME}" "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+
+# migrate the database if needed (only one container should do this)
+if [ "${RUN_MIGRATIONS:-1}" = "1" ]; then
+    echo "INFO: Beginning database migrations..."
+    flask db upgrade
+    flask db stamp head
+    echo "INFO: Completed database migrations!"
+fi
 
 # start the app
 echo "Setup complete!"
@@ -0,0 +1,77 @@
+"""A load test of how many concurrent requests the web app can serve, e.g. to compare gunicorn's worker classes.
+
+Usage:
+    python prod/load_test.py http://localhost:5600/ --concurrency 50 --requests 1000
+
+Run it against the same server once with `GUNICORN_WORKER_CLASS=sync` and once with `GUNICORN_WORKER_CLASS=gevent`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+_local = threading.local()
+
+
+def _get(url: str, timeout: float) -> tuple[float, bool]:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+    start_time = time.perf_counter()
+    try:
+        ok = session.get(url, timeout=timeout).ok
+    except requests.RequestException:
+        ok = False
+    return time.perf_counter() - start_time, ok
+
+
+def _percentile(sorted_values: list[float], percentile: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percentile))]
+
+
+def run_load_test(url: str, concurrency: int, num_requests: int, timeout: float) -> dict:
+    """Sends requests to the URL from a number of concurrent clients.
+
+    Args:
+        url (str): The URL to request.
+        concurrency (int): How many requests to keep in flight at once.
+        num_requests (int): How many requests to send in total.
+        timeout (float): How long to wait for each response, in seconds.
+
+    Returns:
+        dict: The throughput, error count and latency percentiles (in milliseconds) of the test.
+    """
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: _get(url, timeout), range(num_requests)))
+    duration = time.perf_counter() - start_time
+
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        "requests": num_requests,
+        "errors": sum(not ok for _, ok in results),
+        "duration_s": round(duration, 2),
+        "requests_per_s": round(num_requests / duration, 1),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("url", help="The URL to load test.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once. Defaults to 50.")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests to send in total. Defaults to 1000.")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds to wait for a response. Defaults to 30.")
+    args = parser.parse_args()
+
+    for name, value in run_load_test(args.url, args.concurrency, args.requests, args.timeout).items():
+        print(f"{name:>15}: {value}")
@@ -0,0 +1,82 @@
+"""Fixtures shared by the tests: an app backed by a throwaway sqlite database and cache directory, teams and games."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Callable, Iterator
+
+import pytest
+from flask import Flask
+
+from apps.football_pool import create_app
+from apps.football_pool.get_scores.make_games import EST, Game, GameStatus
+from apps.football_pool.models import Conference, Division, Owner, Team, db
+from apps.football_pool.years import get_current_season_start_year
+
+
+@pytest.fixture
+def app(tmp_path) -> Iterator[Flask]:
+    config_path = tmp_path / "config.py"
+    config_path.write_text(
+        "from pathlib import Path\n"
+        f"SQLALCHEMY_DATABASE_URI = 'sqlite:///{tmp_path / 'football_pool.db'}'\n"
+        "SQLALCHEMY_ECHO = False\n"
+        f"CACHE_DIR = Path('{tmp_path / 'cache'}')\n"
+    )
+    app = create_app(config_path)
+    with app.app_context():
+        db.create_all()
+    yield app
+
+
+@pytest.fixture
+def make_team() -> Callable[..., Team]:
+    def make_team(abbreviation: str, **columns) -> Team:
+        columns = {
+            "city": "City",
+            "name": abbreviation,
+            "conference": Conference.AFC,
+            "division": Division.EAST,
+        } | columns
+        return Team(abbreviation=abbreviation, **columns)
+
+    return make_team
+
+
+@pytest.fixture
+def make_game() -> Callable[..., Game]:
+    def make_game(
+        home_team: Team, away_team: Team, status: GameStatus, scores: tuple[int, int], clock: str | None = None
+    ) -> Game:
+        return Game(
+            home_team=home_team,
+            home_team_score=scores[0],
+            away_team=away_team,
+            away_team_score=scores[1],
+            espn_url="https://www.espn.com/nfl/game",
+            gametime=datetime(2025, 10, 5, 13, tzinfo=EST),
+            status=status,
+            display_clock=clock,
+            quarter=None if status == GameStatus.QUEUED else 4,
+        )
+
+    return make_game
+
+
+@pytest.fixture
+def home_and_away(app: Flask, make_team: Callable[..., Team]) -> tuple[Team, Team]:
+    """Two teams, HOM and AWY, of which only HOM is owned this season. Detached, like the team map's Teams."""
+    with app.app_context():
+        home, away = make_team("HOM"), make_team("AWY")
+        db.session.add_all([home, away])
+        db.session.flush()
+        db.session.add(
+            Owner(
+                first_name="Home", last_name="Owner", team_id=home.id, season_start_year=get_current_season_start_year()
+            )
+        )
+        db.session.commit()
+        for team in (home, away):
+            db.session.refresh(team)
+            db.session.expunge(team)
+    return home, away
@@ -0,0 +1,135 @@
+"""Checks that a backfill settles each missed week once, rolling the pot over between them."""
+
+from __future__ import annotations
+
+import pytest
+from flask import Flask
+
+from apps.football_pool.get_scores import backfill
+from apps.football_pool.get_scores.backfill import SEASON_TYPE_PARAMS, WeekKey, backfill_season, get_season_weeks
+from apps.football_pool.get_scores.exceptions import ESPNUnavailableError
+from apps.football_pool.get_scores.make_games import SeasonType
+from apps.football_pool.models import Owner, Pot, SettledWeek, Team, WinningGame, db
+from apps.football_pool.years import get_current_season_start_year
+
+SCORES = {
+    (SeasonType.REGULAR_SEASON, 1): (31, 10),
+    (SeasonType.REGULAR_SEASON, 2): (50, 3),
+    (SeasonType.REGULAR_SEASON, 3): (20, 24),
+}
+"""The (HOM, AWY) scores of the finished weeks, the rest haven't been played."""
+
+
+def _scoreboard(week_key: WeekKey) -> dict:
+    _, season_type, week = week_key
+    home_score, away_score = SCORES.get((season_type, week), (0, 0))
+    final = (season_type, week) in SCORES
+    return {
+        "leagues": [{"season": {"type": {"type": SEASON_TYPE_PARAMS[season_type]}}}],
+        "week": {"number": week},
+        "events": [
+            {
+                "date": "2025-10-05T17:00Z",
+                "status": {
+                    "type": {"name": "STATUS_FINAL" if final else "STATUS_SCHEDULED"},
+                    "displayClock": "0:00",
+                    "period": 4,
+                },
+                "links": [{"href": "https://www.espn.com/nfl/game"}],
+                "competitions": [
+                    {
+                        "competitors": [
+                            {"homeAway": "home", "team": {"abbreviation": "HOM"}, "score": str(home_score)},
+                            {"homeAway": "away", "team": {"abbreviation": "AWY"}, "score": str(away_score)},
+                        ]
+                    }
+                ],
+            }
+        ],
+    }
+
+
+@pytest.fixture(autouse=True)
+def season(app: Flask, home_and_away: tuple[Team, Team], monkeypatch: pytest.MonkeyPatch) -> None:
+    with app.app_context():
+        db.session.add(Pot(amount=10))
+        db.session.commit()
+    monkeypatch.setattr(backfill, "fetch_week", lambda app, week_key: _scoreboard(week_key))
+
+
+def test_backfills_missed_weeks_once(app: Flask):
+    with app.app_context():
+        report = backfill_season()
+        assert [week for _, _, week in report.settled] == [1, 2, 3]
+        assert len(report.skipped) == 15 + 4  # the unplayed regular season and postseason weeks
+        games = [(game.week, game.team.abbreviation, game.winning_type, game.winnings) for game in WinningGame.query]
+        # HOM (owned) takes week 1's pot, then AWY's wins roll it over
+        assert sorted(games) == [
+            (1, "HOM", "MOST", 10),
+            (2, "AWY", "LEAST", 10),
+            (2, "HOM", "FIFTY", 50),
+            (3, "AWY", "MOST", 20),
+        ]
+        assert Owner.query.one().winnings == 60
+        assert Pot.query.one().amount == 30
+
+        report = backfill_season()
+        assert not report.settled and report.winning_games == 0
+        assert SettledWeek.query.count() == 3
+        assert Owner.query.one().winnings == 60
+
+
+def test_a_missed_week_blocks_the_weeks_after_it(app: Flask, monkeypatch: pytest.MonkeyPatch):
+    def fetch_week(app: Flask, week_key: WeekKey) -> dict:
+        if week_key[1:] == (SeasonType.REGULAR_SEASON, 2):
+            raise ESPNUnavailableError(url="https://espn", reason="the circuit breaker is open")
+        return _scoreboard(week_key)
+
+    monkeypatch.setattr(backfill, "fetch_week", fetch_week)
+    with app.app_context():
+        report = backfill_season()
+        assert [week for _, _, week in report.settled] == [1]
+        season_start_year = get_current_season_start_year()
+        assert report.skipped[(season_start_year, SeasonType.REGULAR_SEASON, 2)].endswith("the circuit breaker is open")
+        assert "week 2 isn't settled" in report.skipped[(season_start_year, SeasonType.REGULAR_SEASON, 3)]
+        assert list(report.skipped) == [
+            week_key for week_key in get_season_weeks(season_start_year) if week_key in report.skipped
+        ]
+
+        monkeypatch.setattr(backfill, "fetch_week", lambda app, week_key: _scoreboard(week_key))
+        report = backfill_season()
+        assert [week for _, _, week in report.settled] == [2, 3]
+        # week 3 is paid the pot rolled over from week 2, like in an uninterrupted backfill
+        assert WinningGame.query.filter_by(week=3).one().winnings == 20
+        assert Pot.query.one().amount == 30
+
+
+def test_backfills_a_postseason_week_sharing_a_fifty_weeks_number(
+    app: Flask, home_and_away: tuple[Team, Team], monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setitem(SCORES, (SeasonType.POSTSEASON, 2), (50, 3))
+    home, _ = home_and_away
+    with app.app_context():
+        report = backfill_season()
+        assert (get_current_season_start_year(), SeasonType.POSTSEASON, 2) in report.settled
+        games = [
+            (game.season_type, game.week, game.winning_type, game.winnings)
+            for game in WinningGame.query.filter_by(week=2, team_id=home.id)
+        ]
+        assert sorted(games) == [
+            (SeasonType.POSTSEASON, 2, "FIFTY", 50),
+            (SeasonType.POSTSEASON, 2, "PLAYOFF", 10),
+            (SeasonType.REGULAR_SEASON, 2, "FIFTY", 50),
+        ]
+        assert Owner.query.one().winnings == 60 + 10 + 50
+        assert Pot.query.one().amount == 30  # the postseason doesn't roll the pot over
+
+
+def test_dry_run_writes_nothing(app: Flask):
+    result = app.test_cli_runner().invoke(args=["pool", "backfill", "--dry-run", "--concurrency", "2"])
+    assert result.exit_code == 0
+    assert "Settled Regular Season week 3." in result.output
+    with app.app_context():
+        assert WinningGame.query.count() == 0
+        assert SettledWeek.query.count() == 0
+        assert Pot.query.one().amount == 10
@@ -0,0 +1,35 @@
+"""Checks that the circuit breaker lets a single trial request through once its cooldown passes."""
+
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+
+from apps.football_pool.get_scores.client import BreakerState, ESPNClient
+
+
+def test_half_open_admits_a_single_trial():
+    client = ESPNClient(
+        connect_timeout=1,
+        read_timeout=1,
+        max_retries=0,
+        retry_backoff=0,
+        breaker_threshold=1,
+        breaker_cooldown=timedelta(minutes=1),
+    )
+    client._breaker_state = BreakerState.OPEN
+    client._opened_at = time.monotonic() - 120  # the cooldown has passed
+    barrier = threading.Barrier(8)
+    admitted = []
+
+    def request() -> None:
+        barrier.wait()
+        admitted.append(client._allow_request())
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert admitted.count(True) == 1
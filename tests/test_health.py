@@ -0,0 +1,41 @@
+"""Checks the liveness and readiness probes."""
+
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+
+import pytest
+from flask import Flask
+
+from apps.football_pool.health import DatabaseCheck
+
+
+def test_liveness(app: Flask):
+    response = app.test_client().get("/healthcheck/live")
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == "ok"
+
+
+def test_readiness(app: Flask):
+    response = app.test_client().get("/healthcheck/ready")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["ready"] is True
+    assert body["database"]["ok"] is True
+    assert body["scoreboard"] == {"exists": False, "fresh": False, "servable": False}
+
+
+def test_not_ready_when_database_hangs(app: Flask, monkeypatch: pytest.MonkeyPatch):
+    released = threading.Event()
+    monkeypatch.setattr(DatabaseCheck, "_ping", lambda self: released.wait())
+    app.config["HEALTHCHECK_TIMEOUT"] = timedelta(seconds=0.05)
+    client = app.test_client()
+    try:
+        first, second = client.get("/healthcheck/ready"), client.get("/healthcheck/ready")
+    finally:
+        released.set()
+    assert first.status_code == second.status_code == 503
+    assert "timed out" in first.get_json()["database"]["error"]
+    # the stuck check isn't piled onto
+    assert "still waiting" in second.get_json()["database"]["error"]
@@ -0,0 +1,30 @@
+"""Checks that the scheduler worker persists its jobs, and keeps their schedule across restarts."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from flask import Flask
+
+from apps.football_pool.get_scores import EST
+from apps.football_pool.job_scheduling import COMPUTE_RESULTS_JOB_ID, SETTLE_WEEK_JOB_ID, start_scheduler
+
+
+def test_jobs_persist_across_restarts(app: Flask):
+    scheduler = start_scheduler(app)
+    try:
+        job = scheduler.get_job(COMPUTE_RESULTS_JOB_ID)
+        assert job is not None
+        assert (job.next_run_time.weekday(), job.next_run_time.hour) == (1, 1)  # Tuesday at 1AM
+        # e.g. a run that got postponed, which a restart mustn't reset
+        postponed_run_time = job.next_run_time + timedelta(days=1)
+        scheduler.modify_job(COMPUTE_RESULTS_JOB_ID, next_run_time=postponed_run_time)
+    finally:
+        scheduler.shutdown()
+
+    scheduler = start_scheduler(app)
+    try:
+        assert {job.id for job in scheduler.get_jobs()} == {COMPUTE_RESULTS_JOB_ID, SETTLE_WEEK_JOB_ID}
+        assert scheduler.get_job(COMPUTE_RESULTS_JOB_ID).next_run_time == postponed_run_time.astimezone(EST)
+    finally:
+        scheduler.shutdown()
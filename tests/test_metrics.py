@@ -0,0 +1,46 @@
+"""Checks that `/metrics` serves the app's metrics in Prometheus' format."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+from flask import Flask
+
+
+def test_metrics(app: Flask):
+    client = app.test_client()
+    client.get("/about")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    assert (
+        'football_pool_request_duration_seconds_count{endpoint="football_pool.about",method="GET",status="200"}' in body
+    )
+    assert 'football_pool_cache_lookups_total{cache="page",result="miss"}' in body
+
+
+def test_metrics_include_every_containers(app: Flask, tmp_path, monkeypatch: pytest.MonkeyPatch):
+    shared_dir = tmp_path / "metrics"
+    for container in ("flask_app", "scheduler"):
+        (shared_dir / container).mkdir(parents=True)
+    # the scheduler records its jobs in its own process, and its own container's directory
+    job = textwrap.dedent(
+        """
+        from apps.football_pool.metrics import observe_job
+
+        with observe_job("write_to_db"):
+            pass
+        """
+    )
+    env = os.environ | {"PROMETHEUS_MULTIPROC_DIR": str(shared_dir / "scheduler")}
+    subprocess.run([sys.executable, "-c", job], env=env, check=True)
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(shared_dir / "flask_app"))
+    app.config["METRICS_SHARED_DIR"] = str(shared_dir)
+    body = app.test_client().get("/metrics").get_data(as_text=True)
+    assert 'football_pool_job_duration_seconds_count{job="write_to_db",outcome="success"} 1.0' in body
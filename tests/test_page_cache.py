@@ -0,0 +1,40 @@
+"""Checks that cached pages are only ever served for the season's current data, and only for real seasons."""
+
+from __future__ import annotations
+
+from flask import Flask
+
+from apps.football_pool.page_cache import get_page_cache
+from apps.football_pool.years import get_current_season_start_year
+
+
+def test_page_rendered_while_season_changed_isnt_served(app: Flask):
+    season_start_year = get_current_season_start_year()
+    with app.test_request_context():
+        cache = get_page_cache()
+        version = cache.version(season_start_year)
+        cache.set("results", season_start_year, "light", version, "before")
+        # the season changes (e.g. a week is settled) while a request is rendering its old data
+        cache.invalidate(season_start_year)
+        cache.set("results", season_start_year, "light", version, "stale")
+        new_version = cache.version(season_start_year)
+        assert new_version != version
+        assert cache.get("results", season_start_year, "light", new_version) is None
+
+        cache.set("results", season_start_year, "light", new_version, "after")
+        # superseded versions are pruned
+        assert [path.name for path in cache.cache_dir.glob("*.html")] == [
+            f"{season_start_year}.results.light.{new_version}.html"
+        ]
+
+
+def test_untracked_season_cookie_uses_current_season(app: Flask):
+    client = app.test_client()
+    client.set_cookie("season_start_year", "1900")
+    assert client.get("/assignments").status_code == 200
+    client.set_cookie("season_start_year", "not a year")
+    assert client.get("/assignments").status_code == 200
+    assert client.post("/set-year", data={"season_start_year": "1900"}).status_code == 400
+    with app.app_context():
+        pages = [path.name for path in get_page_cache().cache_dir.glob("*.html")]
+    assert [page.split(".")[0] for page in pages] == [str(get_current_season_start_year())]
@@ -0,0 +1,160 @@
+"""Keeps the views from regressing into N+1 queries, by capping how many queries each one may run."""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+import pytest
+from flask import Flask
+from sqlalchemy import event
+
+from apps.football_pool.get_scores.leaderboard import refresh_season_leaderboard
+from apps.football_pool.get_scores.make_games import SeasonType
+from apps.football_pool.models import (
+    LeaderboardEntry,
+    Owner,
+    Team,
+    WinningGame,
+    WinningType,
+    db,
+)
+
+SEASON_START_YEAR = 2025
+NUM_TEAMS = 32
+NUM_WEEKS = 18
+
+QUERY_BUDGETS = {
+    "/assignments": 1,
+    "/results": 2,
+}
+"""The most queries each view may run, regardless of how many rows it renders."""
+
+
+@pytest.fixture(autouse=True)
+def season(app: Flask, make_team: Callable[..., Team]) -> None:
+    with app.app_context():
+        _seed_season(make_team)
+
+
+def _seed_season(make_team: Callable[..., Team]) -> None:
+    """Seeds a season of teams, owners (all but one team is owned), weekly winning games and the leaderboard."""
+    teams = [
+        make_team(f"T{i:02}", city=f"City {i}", name=f"Team {i}", logo_url=f"logos/T{i:02}.png")
+        for i in range(NUM_TEAMS)
+    ]
+    db.session.add_all(teams)
+    db.session.flush()
+    db.session.add_all(
+        Owner(first_name="Owner", last_name=str(i), team_id=team.id, season_start_year=SEASON_START_YEAR, winnings=10)
+        for i, team in enumerate(teams[1:])
+    )
+    db.session.add_all(
+        WinningGame(
+            season_type=SeasonType.REGULAR_SEASON,
+            week=week,
+            winnings=10,
+            winning_type=WinningType.MOST,
+            team_id=teams[week % NUM_TEAMS].id,
+            season_start_year=SEASON_START_YEAR,
+        )
+        for week in range(NUM_WEEKS)
+    )
+    db.session.add(
+        WinningGame(
+            season_type=SeasonType.REGULAR_SEASON,
+            week=1,
+            winnings=50,
+            winning_type=WinningType.FIFTY,
+            team_id=teams[2].id,
+            season_start_year=SEASON_START_YEAR,
+        )
+    )
+    refresh_season_leaderboard(SEASON_START_YEAR)
+    db.session.commit()
+
+
+@contextmanager
+def count_queries(app: Flask) -> Iterator[list[str]]:
+    """Records the SQL statements executed within the context."""
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize("path", QUERY_BUDGETS)
+def test_query_budget(app: Flask, path: str):
+    client = app.test_client()
+    client.set_cookie("season_start_year", str(SEASON_START_YEAR))
+    with count_queries(app) as statements:
+        response = client.get(path)
+    assert response.status_code == 200
+    assert len(statements) <= QUERY_BUDGETS[path], "\n\n".join(statements)
+
+
+def test_results_include_unowned_teams(app: Flask):
+    client = app.test_client()
+    client.set_cookie("season_start_year", str(SEASON_START_YEAR))
+    html = client.get("/results").get_data(as_text=True)
+    assert html.count("<td>Most</td>") == NUM_WEEKS
+    assert "No one (Rigged!!!)" in html
+    assert "City 1 Team 1" in html
+
+
+def test_leaderboard_matches_ledger(app: Flask):
+    with app.app_context():
+        entries = LeaderboardEntry.query.order_by(LeaderboardEntry.rank, LeaderboardEntry.owner_id).all()
+        assert len(entries) == NUM_TEAMS - 1
+        leader = entries[0]
+        assert (leader.owner.team_id, leader.winnings, leader.most_wins, leader.fifty_wins) == (3, 60, 1, 1)
+        assert [entry.rank for entry in entries[1:17]] == [2] * 16
+        assert {entry.rank for entry in entries[17:]} == {18}
+        assert all(entry.winnings == 0 for entry in entries[17:])
+
+
+def test_cached_pages_until_season_changes(app: Flask):
+    client = app.test_client()
+    client.set_cookie("season_start_year", str(SEASON_START_YEAR))
+    client.get("/results")
+    with count_queries(app) as statements:
+        html = client.get("/results").get_data(as_text=True)
+    assert statements == []
+    assert html.count("<td>Least</td>") == 0
+
+    with app.app_context():
+        db.session.add(
+            WinningGame(
+                season_type=SeasonType.REGULAR_SEASON,
+                week=NUM_WEEKS,
+                winnings=10,
+                winning_type=WinningType.LEAST,
+                team_id=1,
+                season_start_year=SEASON_START_YEAR,
+            )
+        )
+        db.session.commit()
+    html = client.get("/results").get_data(as_text=True)
+    assert html.count("<td>Least</td>") == 1
+
+
+@pytest.mark.parametrize("path", ["/results", "/assignments", "/about"])
+def test_unchanged_pages_not_modified(app: Flask, path: str):
+    client = app.test_client()
+    client.set_cookie("season_start_year", str(SEASON_START_YEAR))
+    etag = client.get(path).headers["ETag"]
+    with count_queries(app) as statements:
+        response = client.get(path, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert statements == []
+
+    client.set_cookie("theme", "dark")
+    assert client.get(path, headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,17 @@
+"""Checks that every request reports the time spent in each of its phases."""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+from flask import Flask
+
+
+def test_server_timing_header(app: Flask, caplog: pytest.LogCaptureFixture):
+    caplog.set_level(logging.INFO)
+    response = app.test_client().get("/about")
+    phases = dict(metric.split(";dur=") for metric in response.headers["Server-Timing"].split(", "))
+    assert {"render", "total"} <= phases.keys()
+    assert float(phases["render"]) <= float(phases["total"])
+    assert any('"endpoint":"football_pool.about"' in record.getMessage() for record in caplog.records)
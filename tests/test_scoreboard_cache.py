@@ -0,0 +1,69 @@
+"""Checks that the scoreboard keeps being served, stale, while it's refreshed or while ESPN is unavailable."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from apps.football_pool.get_scores import query
+from apps.football_pool.get_scores.cache import ScoreboardSnapshot, get_scoreboard_cache
+from apps.football_pool.get_scores.exceptions import ESPNUnavailableError
+from apps.football_pool.models import Pot, db
+
+
+def _snapshot(digest: str, age: float) -> ScoreboardSnapshot:
+    return ScoreboardSnapshot(payload={"digest": digest}, digest=digest, fetched_at=time.time() - age)
+
+
+def test_serves_stale_while_refreshing_in_background(app: Flask):
+    refreshed = threading.Event()
+
+    def fetch(previous: ScoreboardSnapshot | None) -> ScoreboardSnapshot:
+        assert previous is not None and previous.digest == "old"
+        refreshed.wait(timeout=5)
+        return _snapshot("new", age=0)
+
+    with app.app_context():
+        cache = get_scoreboard_cache()
+        cache.write("key", _snapshot("old", age=cache.ttl + 1))
+        # the expired snapshot is served straight away, while the refresh waits on "ESPN"
+        assert cache.get("key", fetch).digest == "old"
+        refreshed.set()
+        deadline = time.time() + 5
+        while cache.read("key").digest != "new" and time.time() < deadline:  # type: ignore[union-attr]
+            time.sleep(0.01)
+        assert cache.get("key", fetch).digest == "new"
+
+
+def test_too_stale_snapshots_are_not_served(app: Flask):
+    def fetch(previous: ScoreboardSnapshot | None) -> ScoreboardSnapshot:
+        raise ESPNUnavailableError(url="url", reason="down")
+
+    with app.app_context():
+        cache = get_scoreboard_cache()
+        cache.write("key", _snapshot("old", age=cache.ttl + cache.max_staleness + 1))
+        with pytest.raises(ESPNUnavailableError):
+            cache.get("key", fetch)
+        cache.write("key", _snapshot("old", age=cache.ttl + 1))
+        with pytest.raises(ESPNUnavailableError):
+            cache.get("key", fetch, allow_stale=False)
+
+
+def test_index_without_scoreboard(app: Flask, monkeypatch: pytest.MonkeyPatch):
+    def fetch_scoreboard(*args, **kwargs) -> ScoreboardSnapshot:
+        raise ESPNUnavailableError(url="url", reason="down")
+
+    monkeypatch.setattr(query, "fetch_scoreboard", fetch_scoreboard)
+    with app.app_context():
+        db.session.add(Pot(amount=10))
+        db.session.commit()
+    client = app.test_client()
+
+    response = client.get("/")
+    assert response.status_code == 503
+    assert "Live scores are unavailable" in response.get_data(as_text=True)
+    # the fragment keeps polling, but isn't re-rendered while it's still unavailable
+    assert client.get("/scoreboard", query_string={"digest": "unavailable"}).status_code == 204
@@ -0,0 +1,11 @@
+"""Checks that the scoreboard stream is only served where it's been enabled, i.e. by async workers."""
+
+from __future__ import annotations
+
+from flask import Flask
+
+
+def test_stream_not_served_by_default(app: Flask):
+    # an open stream would hold a sync worker for as long as the browser is connected
+    assert not app.config["SCOREBOARD_STREAM_SERVE"]
+    assert app.test_client().get("/stream/scoreboard").status_code == 404
@@ -0,0 +1,80 @@
+"""Checks that a week is settled once all of its games have been final for the grace period, and only once."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from apps.football_pool.get_scores import settlement
+from apps.football_pool.get_scores.make_games import CALLED_OFF_STATUSES, EST, GameStatus, SeasonType
+from apps.football_pool.models import WinningType
+
+
+@dataclass
+class FakeGame:
+    status: GameStatus
+    gametime: datetime = field(default_factory=lambda: datetime.now(tz=EST))
+    away_team: SimpleNamespace = field(default_factory=lambda: SimpleNamespace(abbreviation="AWY"))
+    home_team: SimpleNamespace = field(default_factory=lambda: SimpleNamespace(abbreviation="HOM"))
+
+    @property
+    def is_final(self) -> bool:
+        return self.status == GameStatus.FINAL
+
+    @property
+    def is_called_off(self) -> bool:
+        return self.status in CALLED_OFF_STATUSES
+
+
+@dataclass
+class FakeWeek:
+    games: list[FakeGame]
+    week: int = 5
+    season_type: SeasonType = SeasonType.REGULAR_SEASON
+    winning_type: WinningType = WinningType.MOST
+    settled: list[int] = field(default_factory=list)
+
+
+@pytest.fixture
+def week(monkeypatch: pytest.MonkeyPatch) -> FakeWeek:
+    week = FakeWeek(games=[FakeGame(GameStatus.FINAL), FakeGame(GameStatus.IN_PROGRESS)])
+    monkeypatch.setattr(settlement, "get_live_scores", lambda allow_stale: week)
+    monkeypatch.setattr(
+        settlement, "write_to_db", lambda app, current_week: current_week.settled.append(current_week.week) or True
+    )
+    monkeypatch.setattr(settlement, "is_week_settled", lambda season_start_year, season_type, week_num: week.settled)
+    monkeypatch.setattr(settlement, "_FINAL_SINCE", {})
+    return week
+
+
+def test_settles_once_every_game_is_final(app: Flask, week: FakeWeek):
+    # a game is still being played (e.g. it was postponed to Tuesday)
+    assert not settlement.settle_week_if_over(app, grace=timedelta(0))
+    week.games[1].status = GameStatus.FINAL
+    assert settlement.settle_week_if_over(app, grace=timedelta(0))
+    # neither the next check nor the backstop settle it again
+    assert not settlement.settle_week_if_over(app, grace=timedelta(0))
+    assert week.settled == [5]
+
+
+def test_waits_for_the_grace_period(app: Flask, week: FakeWeek):
+    week.games[1].status = GameStatus.FINAL
+    assert not settlement.settle_week_if_over(app, grace=timedelta(minutes=10))
+    assert week.settled == []
+
+
+def test_called_off_games_stop_holding_up_the_week(app: Flask, week: FakeWeek):
+    week.games[1].status = GameStatus.POSTPONED
+    # it may still be played this week, once ESPN sets its new date
+    assert not settlement.settle_week_if_over(app, grace=timedelta(0))
+    week.games[1].gametime -= app.config["SETTLEMENT_POSTPONED_GRACE"]
+    assert settlement.settle_week_if_over(app, grace=timedelta(0))
+
+    week.games[1].status = GameStatus.CANCELED
+    week.games[1].gametime = datetime.now(tz=EST)
+    week.settled.clear()
+    assert settlement.settle_week_if_over(app, grace=timedelta(0))
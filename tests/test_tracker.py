@@ -0,0 +1,117 @@
+"""Checks that the live tracker's leaders always match the winner engine's, however the scores got there."""
+
+from __future__ import annotations
+
+import random
+from typing import Callable
+
+from flask import Flask
+
+from apps.football_pool.get_scores.make_games import CurrentWeek, Game, GameStatus, SeasonType
+from apps.football_pool.get_scores.tracker import LiveWinnerTracker, TrackerUpdate
+from apps.football_pool.get_scores.winners import compute_week_winners
+from apps.football_pool.models import Team, WinningType
+
+GameState = tuple[int, int, GameStatus]
+
+
+def _assert_matches_engine(
+    tracker: LiveWinnerTracker, update: TrackerUpdate, current_week: CurrentWeek, before: dict[WinningType, frozenset]
+) -> None:
+    winners = compute_week_winners(current_week)
+    assert tracker.leaders == {
+        WinningType.MOST: frozenset(winners.most),
+        WinningType.LEAST: frozenset(winners.least),
+        WinningType.FIFTY: frozenset(winners.fifty),
+    }
+    # the reported changes take the previous leaders to the new ones
+    for change in update.leader_changes:
+        assert change.leaders == tracker.leaders[change.winning_type]
+        assert change.added == change.leaders - before[change.winning_type]
+        assert change.removed == before[change.winning_type] - change.leaders
+    unchanged = set(tracker.leaders) - {change.winning_type for change in update.leader_changes}
+    assert all(tracker.leaders[winning_type] == before[winning_type] for winning_type in unchanged)
+
+
+def _next_state(rng: random.Random, state: GameState) -> GameState:
+    home_score, away_score, status = state
+    if status == GameStatus.QUEUED:
+        return (0, 0, rng.choice((GameStatus.IN_PROGRESS, GameStatus.POSTPONED)))
+    if status in (GameStatus.IN_PROGRESS, GameStatus.HALFTIME):
+        # mostly scoring, but sometimes a score is corrected down
+        home_score = max(0, home_score + rng.choice((-7, -3, 0, 2, 3, 7, 7)))
+        away_score = max(0, away_score + rng.choice((-7, -3, 0, 2, 3, 7, 7)))
+        if rng.random() < 0.1:
+            home_score = 50  # a blowout, which a random walk would rarely land on exactly
+        status = rng.choice((GameStatus.IN_PROGRESS, GameStatus.IN_PROGRESS, GameStatus.HALFTIME, GameStatus.FINAL))
+        return (home_score, away_score, status)
+    if status == GameStatus.FINAL and rng.random() < 0.5:
+        return (max(0, home_score - 3), away_score, status)  # a stat correction after the game
+    return state
+
+
+def _snapshot(
+    week: tuple[SeasonType, int],
+    teams: list[Team],
+    states: list[GameState],
+    make_game: Callable[..., Game],
+) -> CurrentWeek:
+    games = [
+        make_game(
+            home_team, away_team, status, (home_score, away_score), None if status == GameStatus.QUEUED else "0:00"
+        )
+        for home_team, away_team, (home_score, away_score, status) in zip(teams[0::2], teams[1::2], states)
+    ]
+    return CurrentWeek(week=week[1], games=games, season_type=week[0])
+
+
+def test_tracker_matches_engine(app: Flask, make_team: Callable[..., Team], make_game: Callable[..., Game]):
+    teams = [make_team(f"T{i:02}") for i in range(16)]
+    rng = random.Random(2025)
+    tracker = LiveWinnerTracker()
+    with app.app_context():
+        # the same tracker follows each week in turn, starting over whenever the week changes
+        for week in [(SeasonType.REGULAR_SEASON, number) for number in range(1, 9)] + [(SeasonType.POSTSEASON, 1)]:
+            states: list[GameState] = [(0, 0, GameStatus.QUEUED)] * (len(teams) // 2)
+            for _ in range(60):
+                for index in rng.sample(range(len(states)), k=rng.randint(0, 3)):
+                    states[index] = _next_state(rng, states[index])
+                current_week = _snapshot(week, teams, states, make_game)
+                before = tracker.leaders
+                _assert_matches_engine(tracker, tracker.update(current_week), current_week, before)
+
+
+def test_scores_going_down_and_games_ending(app: Flask, make_team: Callable[..., Team], make_game: Callable[..., Game]):
+    first_home, first_away, second_home, second_away = (
+        make_team(abbreviation) for abbreviation in ("FH", "FA", "SH", "SA")
+    )
+
+    def week(first: GameState, second: GameState) -> CurrentWeek:
+        return CurrentWeek(
+            week=1,  # a MOST week
+            games=[
+                make_game(first_home, first_away, first[2], first[:2], "7:31"),
+                make_game(second_home, second_away, second[2], second[:2], "7:31"),
+            ],
+            season_type=SeasonType.REGULAR_SEASON,
+        )
+
+    tracker = LiveWinnerTracker()
+    with app.app_context():
+        tracker.update(week((14, 7, GameStatus.IN_PROGRESS), (10, 3, GameStatus.IN_PROGRESS)))
+        assert tracker.leaders[WinningType.MOST] == {first_home}
+
+        # the 14 is corrected down to 7, so the 10 is the most points scored
+        update = tracker.update(week((7, 7, GameStatus.IN_PROGRESS), (10, 3, GameStatus.IN_PROGRESS)))
+        (change,) = [change for change in update.leader_changes if change.winning_type == WinningType.MOST]
+        assert (change.added, change.removed) == ({second_home}, {first_home})
+
+        # a game ending changes the game, but not the leaders
+        update = tracker.update(week((7, 7, GameStatus.FINAL), (10, 3, GameStatus.IN_PROGRESS)))
+        assert [game.home_team for game in update.changed_games] == [first_home]
+        assert not update.leader_changes
+
+        # once the other game is called off, its teams are no longer leading
+        tracker.update(week((7, 7, GameStatus.FINAL), (10, 3, GameStatus.POSTPONED)))
+        assert tracker.leaders[WinningType.MOST] == {first_home, first_away}
+        assert tracker.leaders[WinningType.LEAST] == {first_home, first_away}
@@ -0,0 +1,92 @@
+"""Checks that the winner engine follows the pool's rules, as the separate per-WinningType functions applied them."""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from typing import Callable
+
+from flask import Flask
+
+from apps.football_pool.get_scores.make_games import CurrentWeek, Game, GameStatus, SeasonType
+from apps.football_pool.get_scores.winners import compute_week_winners
+from apps.football_pool.models import Team, WinningType
+
+SCORES = (0, 3, 7, 10, 13, 17, 24, 50)
+"""Few enough scores for most weeks to have ties, and some 50-point scorers."""
+
+
+def _teams_and_scores(game: Game) -> tuple[tuple[Team, int], tuple[Team, int]]:
+    return (game.home_team, game.home_team_score), (game.away_team, game.away_team_score)
+
+
+def _legacy_winners(current_week: CurrentWeek) -> dict[WinningType, Counter[str]]:
+    """The rules, one WinningType at a time, as `find_teams_with_*_points` and `get_*_winners` applied them."""
+    played_games = [game for game in current_week.games if not game.is_called_off]
+    winners: dict[WinningType, list[Team]] = {}
+    if current_week.is_regular_season:
+        started_scores = [score for game in played_games if not game.is_queued for _, score in _teams_and_scores(game)]
+        pick = max if current_week.winning_type == WinningType.MOST else min
+        points = pick(started_scores, default=0)
+        winners[current_week.winning_type] = [
+            team for game in played_games for team, score in _teams_and_scores(game) if score == points
+        ]
+    winners[WinningType.FIFTY] = [
+        team for game in played_games for team, score in _teams_and_scores(game) if score == 50
+    ]
+    if current_week.is_postseason:
+        completed_winners = [
+            game.home_team if game.home_team_score > game.away_team_score else game.away_team
+            for game in played_games
+            if game.display_clock == "0:00" and game.home_team_score != game.away_team_score
+        ]
+        winners[WinningType.SUPER_BOWL if current_week.is_super_bowl else WinningType.PLAYOFF] = completed_winners
+    return {
+        winning_type: Counter(team.abbreviation for team in teams) for winning_type, teams in winners.items() if teams
+    }
+
+
+def _engine_winners(current_week: CurrentWeek) -> dict[WinningType, Counter[str]]:
+    return {
+        winning_type: Counter(team.abbreviation for team in teams)
+        for winning_type, teams in compute_week_winners(current_week).by_winning_type
+    }
+
+
+def _random_week(rng: random.Random, teams: list[Team], make_game: Callable[..., Game]) -> CurrentWeek:
+    season_type = rng.choice(list(SeasonType))
+    week = rng.randint(1, 5 if season_type == SeasonType.POSTSEASON else 18)
+    games = []
+    for home_team, away_team in zip(teams[0::2], teams[1::2]):
+        if rng.random() < 0.3:
+            continue  # not playing this week
+        status = rng.choice(list(GameStatus))
+        if status == GameStatus.QUEUED:
+            games.append(make_game(home_team, away_team, status, (0, 0), None))
+        else:
+            clock = "0:00" if status == GameStatus.FINAL else rng.choice(("0:00", "7:31"))
+            games.append(make_game(home_team, away_team, status, (rng.choice(SCORES), rng.choice(SCORES)), clock))
+    return CurrentWeek(week=week, games=games, season_type=season_type)
+
+
+def test_engine_matches_the_rules(app: Flask, make_team: Callable[..., Team], make_game: Callable[..., Game]):
+    teams = [make_team(f"T{i:02}") for i in range(16)]
+    rng = random.Random(2025)
+    with app.app_context():
+        for _ in range(500):
+            current_week = _random_week(rng, teams, make_game)
+            assert _engine_winners(current_week) == _legacy_winners(current_week), current_week
+
+
+def test_queued_teams_can_win_least(app: Flask, make_team: Callable[..., Team], make_game: Callable[..., Game]):
+    home, away, queued_home, queued_away = (make_team(abbreviation) for abbreviation in ("HOM", "AWY", "QHM", "QAW"))
+    current_week = CurrentWeek(
+        week=2,  # a LEAST week
+        games=[
+            make_game(home, away, GameStatus.IN_PROGRESS, (7, 0), "7:31"),
+            make_game(queued_home, queued_away, GameStatus.QUEUED, (0, 0)),
+        ],
+        season_type=SeasonType.REGULAR_SEASON,
+    )
+    with app.app_context():
+        assert _engine_winners(current_week) == {WinningType.LEAST: Counter(["AWY", "QHM", "QAW"])}
@@ -0,0 +1,108 @@
+"""Checks that settling a week pays its owners once, however many times it's attempted."""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+
+import pytest
+from flask import Flask
+from sqlalchemy import update
+
+from apps.football_pool.get_scores.make_games import EST, CurrentWeek, Game, GameStatus, SeasonType
+from apps.football_pool.get_scores.write_to_db import write_to_db
+from apps.football_pool.models import Owner, Pot, SettledWeek, Team, WinningGame, db
+
+
+@pytest.fixture
+def current_week(app: Flask, home_and_away: tuple[Team, Team], monkeypatch: pytest.MonkeyPatch) -> CurrentWeek:
+    home, away = home_and_away
+    with app.app_context():
+        db.session.add(Pot(amount=20))
+        db.session.commit()
+        week = CurrentWeek(
+            week=5,  # a MOST week
+            games=[
+                Game(
+                    home_team=home,
+                    home_team_score=31,
+                    away_team=away,
+                    away_team_score=10,
+                    espn_url="https://www.espn.com/nfl/game",
+                    gametime=datetime(2025, 10, 5, 13, tzinfo=EST),
+                    status=GameStatus.FINAL,
+                    display_clock="0:00",
+                    quarter=4,
+                )
+            ],
+            season_type=SeasonType.REGULAR_SEASON,
+        )
+    # the package re-exports `write_to_db`, which shadows the module's name
+    monkeypatch.setattr(sys.modules[write_to_db.__module__], "get_live_scores", lambda allow_stale: week)
+    return week
+
+
+def test_settles_week_once(app: Flask, current_week: CurrentWeek):
+    assert write_to_db(app)
+    assert not write_to_db(app)
+    with app.app_context():
+        assert SettledWeek.query.count() == 1
+        assert [(game.team.abbreviation, game.winnings) for game in WinningGame.query.all()] == [("HOM", 20)]
+        assert Owner.query.one().winnings == 20
+        assert Pot.query.one().amount == 10
+
+
+def test_rewriting_week_pays_nothing_twice(app: Flask, current_week: CurrentWeek):
+    assert write_to_db(app)
+    with app.app_context():
+        # e.g. the week was un-marked by hand to be settled again
+        db.session.query(SettledWeek).delete()
+        db.session.commit()
+    assert write_to_db(app)
+    with app.app_context():
+        assert WinningGame.query.count() == 1
+        assert Owner.query.one().winnings == 20
+
+
+def test_rebuild_restores_totals_from_ledger(app: Flask, current_week: CurrentWeek):
+    assert write_to_db(app)
+    with app.app_context():
+        # e.g. a balance edited by hand, and a pot that wasn't reset
+        db.session.execute(update(Owner).values(winnings=5))
+        db.session.execute(update(Pot).values(amount=30))
+        db.session.commit()
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["pool", "rebuild", "--dry-run"])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ["Home Owner: 5 -> 20", "Pot: 30 -> 10"]
+    with app.app_context():
+        assert Owner.query.one().winnings == 5
+
+    result = runner.invoke(args=["pool", "rebuild"])
+    assert result.exit_code == 0
+    with app.app_context():
+        assert Owner.query.one().winnings == 20
+        assert Pot.query.one().amount == 10
+    assert "match the winning games" in runner.invoke(args=["pool", "rebuild"]).output
+
+
+def test_settling_leaves_corrected_totals_alone(
+    app: Flask, current_week: CurrentWeek, caplog: pytest.LogCaptureFixture
+):
+    with app.app_context():
+        # e.g. a balance corrected by hand, for a payout the ledger doesn't know about
+        db.session.execute(update(Owner).values(winnings=5))
+        db.session.commit()
+    assert write_to_db(app)
+    with app.app_context():
+        assert Owner.query.one().winnings == 25
+    assert "Home Owner: 25 -> 20" in caplog.text
+
+
+def test_settles_the_given_week(app: Flask, current_week: CurrentWeek, monkeypatch: pytest.MonkeyPatch):
+    # e.g. the live scores rolled over to the next week since the given one was checked
+    monkeypatch.setattr(sys.modules[write_to_db.__module__], "get_live_scores", pytest.fail)
+    assert write_to_db(app, current_week)
+    with app.app_context():
+        assert SettledWeek.query.one().week == current_week.week